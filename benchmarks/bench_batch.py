@@ -0,0 +1,66 @@
+"""
+Time building many stored snapshots one by one against build_snapshots.
+
+Snapshots are kept as raw json, as a backfill job reads them from storage.
+The serial baseline parses and builds each one in this process.
+build_snapshots is timed returning whole galaxies, and with a process
+function that returns only a planet count, which is what a backfill that
+writes its results from the workers sends back.
+
+Usage:
+    python benchmarks/bench_batch.py [--snapshots N] [--workers N [N ...]]
+        [--chunksize N] [--scale N]
+"""
+
+import argparse
+import os
+import time
+
+from hd2api import APIConfig, DiveharderAll, build_snapshot, build_snapshots
+from hd2api.util.synthetic import synthetic_snapshot_payload
+from pydantic_core import to_json
+
+
+def count_planets(built) -> int:
+    return len(built.planets)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--snapshots", type=int, default=64)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("--scale", type=int, default=1, help="Synthetic galaxy size.")
+    args = parser.parse_args()
+
+    statics = APIConfig().staticdata()
+    stored = [
+        to_json(synthetic_snapshot_payload(statics, scale=args.scale, seed=seed))
+        for seed in range(args.snapshots)
+    ]
+
+    start = time.perf_counter()
+    for data in stored:
+        build_snapshot(DiveharderAll.model_validate_json(data), statics)
+    serial = time.perf_counter() - start
+    print(f"{args.snapshots} snapshots, {os.cpu_count()} cores")
+    print(f"  serial               {args.snapshots / serial:8.1f} snapshots/s")
+
+    for workers in sorted(set(args.workers)):
+        for label, process in (("galaxies", None), ("counts", count_planets)):
+            start = time.perf_counter()
+            for _ in build_snapshots(
+                stored, statics, workers, args.chunksize, process=process
+            ):
+                pass
+            seconds = time.perf_counter() - start
+            print(
+                f"  {workers:2d} workers, {label:<9}{args.snapshots / seconds:8.1f}"
+                f" snapshots/s{serial / seconds:7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Time build_all_planets on synthetic galaxies.
+
+Each planet is also built with build_planet_full without a shared
+SnapshotIndex, indexing the whole snapshot once per planet, which is how
+expensive every build was when planets were found by scanning lists.
+
+Single planets are built with build_planet_2, which reuses the index kept
+on the snapshot and only builds that planet's regions, and the old way,
+building every region of the galaxy and a new index for each call.
+
+Usage:
+    python benchmarks/bench_builders.py [--scale N [N ...]] [--repeat N]
+"""
+
+import argparse
+
+from hd2api import (
+    APIConfig,
+    DiveharderAll,
+    SnapshotIndex,
+    build_all_planets,
+    build_all_regions,
+    build_planet_2,
+)
+from hd2api.builders.planet_builder import build_planet_full
+from hd2api.util.synthetic import synthetic_snapshot_payload
+from timing import timeit
+
+
+def build_unshared(warall: DiveharderAll, statics) -> None:
+    status, info, summary = warall.status, warall.war_info, warall.planet_stats
+    regions = build_all_regions(warall, statics)
+    for planet_info in info.planetInfos:
+        index = SnapshotIndex(status, info, summary)
+        i = planet_info.index
+        build_planet_full(i, status, info, summary, statics, regions, index)
+
+
+def build_one_unshared(i: int, warall: DiveharderAll, statics) -> None:
+    status, info, summary = warall.status, warall.war_info, warall.planet_stats
+    regions = build_all_regions(warall, statics, SnapshotIndex.from_warall(warall))
+    index = SnapshotIndex(status, info, summary)
+    build_planet_full(i, status, info, summary, statics, regions, index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scale", type=int, nargs="+", default=[1, 10], help="Synthetic galaxy sizes."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    statics = APIConfig().staticdata()
+    for scale in args.scale:
+        warall = DiveharderAll(**synthetic_snapshot_payload(statics, scale=scale))
+        planets = len(warall.war_info.planetInfos)
+
+        index = timeit(lambda: SnapshotIndex.from_warall(warall), args.repeat)
+        shared = timeit(lambda: build_all_planets(warall, statics), args.repeat)
+        unshared = timeit(lambda: build_unshared(warall, statics), 1)
+        # A planet with regions, so building them isn't skipped.
+        i = warall.war_info.planetRegions[0].planetIndex
+        one = timeit(lambda: build_planet_2(i, warall, statics), args.repeat * 20)
+        one_old = timeit(lambda: build_one_unshared(i, warall, statics), args.repeat)
+        print(f"build_all_planets, {planets} planets")
+        print(f"  index only           {index:9.2f} ms")
+        print(f"  shared index         {shared:9.2f} ms")
+        print(f"  index per planet     {unshared:9.2f} ms")
+        print(f"build_planet_2, planet {i}")
+        print(f"  cached index         {one:9.3f} ms")
+        print(f"  all regions          {one_old:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
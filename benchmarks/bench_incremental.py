@@ -0,0 +1,80 @@
+"""
+Compare rebuilding every planet on each poll against rebuild_all_planets.
+
+A sequence of snapshots is generated from one synthetic galaxy, changing
+the health, players and statistics of a fraction of the planets between
+polls, as happens between two polls of the live api.  Every snapshot is
+then built with build_all_planets and with rebuild_all_planets.
+
+Usage:
+    python benchmarks/bench_incremental.py [--scale N] [--changed F] [--polls N]
+"""
+
+import argparse
+import copy
+import random
+import time
+from typing import Any, Dict, List
+
+from hd2api import APIConfig, DiveharderAll, build_all_planets, rebuild_all_planets
+from hd2api.util.synthetic import synthetic_snapshot_payload
+
+
+def make_polls(
+    payload: Dict[str, Any], polls: int, changed: float, seed: int = 0
+) -> List[DiveharderAll]:
+    rng = random.Random(seed)
+    snapshots = []
+    for _ in range(polls):
+        payload = copy.deepcopy(payload)
+        payload["status"]["time"] += 10
+        planets = payload["status"]["planetStatus"]
+        stats = payload["planet_stats"]["planets_stats"]
+        for i in rng.sample(range(len(planets)), int(len(planets) * changed)):
+            planets[i]["health"] = max(planets[i]["health"] - rng.randint(0, 500), 0)
+            planets[i]["players"] = rng.randint(0, 50000)
+            stats[i]["missionsWon"] += rng.randint(0, 50)
+        snapshots.append(DiveharderAll(**payload))
+    return snapshots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=1, help="Synthetic galaxy size.")
+    parser.add_argument(
+        "--changed", type=float, default=0.1, help="Fraction of planets changed per poll."
+    )
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    statics = APIConfig().staticdata()
+    payload = synthetic_snapshot_payload(statics, scale=args.scale)
+    snapshots = make_polls(payload, args.polls + 1, args.changed)
+    planets = len(snapshots[0].war_info.planetInfos)
+
+    start = time.perf_counter()
+    for warall in snapshots[1:]:
+        build_all_planets(warall, statics)
+    full = time.perf_counter() - start
+
+    previous = rebuild_all_planets(None, snapshots[0], statics)
+    reused = 0
+    start = time.perf_counter()
+    for warall in snapshots[1:]:
+        galaxy = rebuild_all_planets(previous, warall, statics)
+        reused += sum(galaxy[i] is previous.get(i, None) for i in galaxy)
+        previous = galaxy
+    incremental = time.perf_counter() - start
+
+    print(f"{planets} planets, {args.changed:.0%} changed per poll, {args.polls} polls")
+    results = (("build_all_planets", full), ("rebuild_all_planets", incremental))
+    for name, seconds in results:
+        print(
+            f"  {name:<20}{seconds / args.polls * 1000:9.2f} ms/poll"
+            f"{planets * args.polls / seconds:12.0f} planets/s"
+        )
+    print(f"  planets reused      {reused / (planets * args.polls):9.1%}")
+
+
+if __name__ == "__main__":
+    main()
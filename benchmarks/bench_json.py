@@ -0,0 +1,64 @@
+"""
+Compare the json decoding paths used to build models from response bodies.
+
+Every installed decoder backend is timed decoding into a dictionary and then
+building the model from it, alongside pydantic validating the raw bytes
+directly with model_validate_json.
+
+Recorded payloads can be given with --payloads, a directory holding
+status.json, war_info.json and planet_stats.json.  Without it, a synthetic
+galaxy generated from the bundled static data is used instead.
+
+Usage:
+    python benchmarks/bench_json.py [--payloads DIR] [--scale N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+from typing import Dict
+
+from hd2api import APIConfig, WarInfo, WarStatus, WarSummary
+from hd2api.services.service_json import available_backends
+from hd2api.util.synthetic import synthetic_snapshot_payload
+from timing import timeit
+
+MODELS = {"status": WarStatus, "war_info": WarInfo, "planet_stats": WarSummary}
+
+
+def load_payloads(directory: str, scale: int) -> Dict[str, bytes]:
+    if directory:
+        payloads = {}
+        for name in MODELS:
+            with open(os.path.join(directory, f"{name}.json"), "rb") as f:
+                payloads[name] = f.read()
+        return payloads
+    synthetic = synthetic_snapshot_payload(APIConfig().staticdata(), scale=scale)
+    return {name: json.dumps(synthetic[name]).encode() for name in MODELS}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--payloads", default="", help="Recorded payload directory.")
+    parser.add_argument("--scale", type=int, default=1, help="Synthetic galaxy size.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads, args.scale)
+    backends = available_backends()
+    print(f"{'payload':<14}{'bytes':>10}  {'path':<22}{'decode ms':>10}{'total ms':>10}")
+    for name, model in MODELS.items():
+        content = payloads[name]
+        for backend, loads in backends.items():
+            decode = timeit(lambda: loads(content), args.repeat)
+            total = timeit(lambda: model(**loads(content)), args.repeat)
+            print(
+                f"{name:<14}{len(content):>10}  {backend + ' + model':<22}"
+                f"{decode:>10.2f}{total:>10.2f}"
+            )
+        total = timeit(lambda: model.model_validate_json(content), args.repeat)
+        print(f"{name:<14}{len(content):>10}  {'model_validate_json':<22}{'':>10}{total:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
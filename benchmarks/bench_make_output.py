@@ -0,0 +1,61 @@
+"""
+Compare building lists of models item by item against the TypeAdapter paths.
+
+The planet and region lists of a synthetic galaxy are built three ways:
+the old per-item ``model(**item, retrieved_at=now)`` comprehension,
+make_output validating the decoded list through a cached TypeAdapter, and
+make_output_from_json validating the raw bytes through the same adapter.
+
+Usage:
+    python benchmarks/bench_make_output.py [--scale N] [--repeat N]
+"""
+
+import argparse
+import datetime
+import json
+
+from hd2api import APIConfig
+from hd2api.models import (
+    PlanetInfo,
+    PlanetRegion,
+    PlanetRegionInfo,
+    PlanetStats,
+    PlanetStatus,
+)
+from hd2api.services.service_json import decode_json, get_json_loads
+from hd2api.services.service_utils import make_output, make_output_from_json
+from hd2api.util.synthetic import synthetic_snapshot_payload
+from timing import timeit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=1, help="Synthetic galaxy size.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = synthetic_snapshot_payload(APIConfig().staticdata(), scale=args.scale)
+    lists = {
+        PlanetStatus: payload["status"]["planetStatus"],
+        PlanetRegion: payload["status"]["planetRegions"],
+        PlanetInfo: payload["war_info"]["planetInfos"],
+        PlanetRegionInfo: payload["war_info"]["planetRegions"],
+        PlanetStats: payload["planet_stats"]["planets_stats"],
+    }
+    print(f"{'model':<18}{'items':>7}{'per item':>11}{'adapter':>11}{'bytes':>11}  (ms)")
+    for model, data in lists.items():
+        content = json.dumps(data).encode()
+        loads = get_json_loads()
+
+        def per_item():
+            now = datetime.datetime.now(tz=datetime.timezone.utc)
+            return [model(**item, retrieved_at=now) for item in loads(content)]
+
+        old = timeit(per_item, args.repeat)
+        adapter = timeit(lambda: make_output(decode_json(content), model), args.repeat)
+        raw = timeit(lambda: make_output_from_json(content, model), args.repeat)
+        print(f"{model.__name__:<18}{len(data):>7}{old:>11.2f}{adapter:>11.2f}{raw:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
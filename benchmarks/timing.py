@@ -0,0 +1,15 @@
+"""Timing helper shared by the benchmarks, which import it as a sibling module."""
+
+import time
+from typing import Callable
+
+
+def timeit(func: Callable[[], object], repeat: int) -> float:
+    """Best of repeat runs, in milliseconds."""
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
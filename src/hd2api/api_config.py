@@ -1,11 +1,108 @@
-from typing import Literal, Optional, Union
+import atexit
+import random
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Union
 
 # pylint: disable=no-name-in-module
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .load_json import load_and_merge_json_files
 from .models import EffectStatic, GalaxyStatic, StaticAll
 
+if TYPE_CHECKING:
+    from .services.service_session import APISession
+
+# Guards creating sessions and the default config, as blocking mode runs
+# getters in worker threads.
+_session_lock = threading.Lock()
+
+# Default seconds to cache each model for, None meaning the entry never expires.
+DEFAULT_CACHE_TTLS: Dict[str, Optional[float]] = {
+    "WarStatus": 10,
+    "WarInfo": 600,
+    "WarSummary": 30,
+    "Assignment": 60,
+    "NewsFeedItem": 30,
+    "Episodes": 600,
+    "SpaceStation": 10,
+    "DiveharderAll": 10,
+    "War": 10,
+    "Assignment2": 60,
+    "Campaign2": 10,
+    "Dispatch": 60,
+    "Planet": 10,
+    "SteamNews": 600,
+}
+
+
+class RetryPolicy(BaseModel):
+    """
+    How failed requests are retried.
+
+    Transport errors and responses with one of retry_statuses are retried with
+    exponential backoff, up to max_attempts total attempts.  Requests aren't
+    retried unless max_attempts is raised above 1.
+    """
+
+    max_attempts: int = Field(
+        default=1, description="Total attempts made per request, including the first."
+    )
+    backoff_base: float = Field(
+        default=0.5, description="Seconds waited before the first retry."
+    )
+    backoff_max: float = Field(
+        default=10.0, description="Upper bound on the seconds waited between attempts."
+    )
+    jitter: float = Field(
+        default=0.5,
+        description="Fraction of each delay that is randomized, to spread out retries.",
+    )
+    retry_statuses: List[int] = Field(
+        default_factory=lambda: [429, 500, 502, 503, 504],
+        description="Status codes that are worth retrying.",
+    )
+    respect_retry_after: bool = Field(
+        default=True, description="Wait as long as a Retry-After header asks."
+    )
+    max_retry_after: float = Field(
+        default=30.0,
+        description="Give up instead of waiting if Retry-After asks for longer than this.",
+    )
+
+    def get_delay(
+        self, attempt: int, retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Get the seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): The number of the attempt that just failed, starting at 1.
+            retry_after (Optional[float]): Seconds asked for by a Retry-After header.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None if the request shouldn't be retried.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = min(self.backoff_base * (2 ** (attempt - 1)), self.backoff_max)
+        delay -= delay * self.jitter * random.random()  # nosec B311
+        if retry_after is not None and self.respect_retry_after:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+class RateLimit(BaseModel):
+    """Token bucket settings limiting how fast requests are sent to one host."""
+
+    rate: float = Field(
+        default=5.0, description="Requests allowed per second, on average."
+    )
+    burst: int = Field(
+        default=10, description="Requests that may be sent at once before pacing."
+    )
+
 
 class APIConfig(BaseModel):
     """
@@ -24,9 +121,22 @@ class APIConfig(BaseModel):
         default="https://api.live.prod.thehelldiversgame.com",
         description="Base path for the game's API directly",
     )
-    use_raw: Literal["community", "diveharder", "direct"] = Field(
+    use_raw: Literal["community", "diveharder", "direct", "failover"] = Field(
         default="direct",
-        description="The source to use when calling raw endpoints, default is 'diveharder'",
+        description="The source to use when calling raw endpoints, default is 'direct'.  "
+        "'failover' tries every source in failover_sources, healthiest first.",
+    )
+    failover_sources: List[Literal["community", "diveharder", "direct"]] = Field(
+        default_factory=lambda: ["direct", "diveharder", "community"],
+        description="Sources tried by the 'failover' mode, in order of preference.",
+    )
+    breaker_threshold: int = Field(
+        default=3,
+        description="Consecutive failures before a failover source is skipped.",
+    )
+    breaker_cooldown: float = Field(
+        default=30.0,
+        description="Seconds a failing failover source is skipped for.",
     )
     verify: Union[bool, str] = Field(default=True, description="Unused")
     client_name: str = Field(
@@ -50,6 +160,179 @@ class APIConfig(BaseModel):
     statics: Optional[StaticAll] = Field(
         default=None, description="Cached static files"
     )
+    max_connections: int = Field(
+        default=20,
+        description="Maximum number of open connections in each pooled client.",
+    )
+    max_keepalive_connections: int = Field(
+        default=10,
+        description="Maximum number of idle connections kept alive in each pooled client.",
+    )
+    keepalive_expiry: float = Field(
+        default=30.0,
+        description="Seconds an idle pooled connection is kept alive for.",
+    )
+    http2: bool = Field(
+        default=False,
+        description="Negotiate HTTP/2 on the pooled clients, so concurrent requests to "
+        "one host share a single connection.  Needs the optional h2 package, "
+        "falling back to HTTP/1.1 without it.",
+    )
+    transport: Literal["live", "record", "replay"] = Field(
+        default="live",
+        description="'record' saves every response to fixture_dir as it's received, "
+        "and 'replay' answers every request from fixture_dir without touching "
+        "the network.",
+    )
+    fixture_dir: str = Field(
+        default="fixtures",
+        description="Directory responses are recorded to and replayed from.",
+    )
+    replay_latency: Union[Literal["recorded"], float, None] = Field(
+        default=None,
+        description="Simulated latency of replayed responses.  None answers "
+        "immediately, a number waits that many seconds, and 'recorded' waits as "
+        "long as the recorded request took.",
+    )
+    compression: bool = Field(
+        default=True,
+        description="Ask for gzip, deflate, and br/zstd where a decoder is installed.  "
+        "If False, responses are requested uncompressed.",
+    )
+    revalidate: bool = Field(
+        default=False,
+        description="Revalidate repeated requests with ETag/Last-Modified, "
+        "reusing a copy of the previously built object when the server answers 304.",
+    )
+    retry: RetryPolicy = Field(
+        default_factory=RetryPolicy,
+        description="How failed requests are retried.",
+    )
+    hedge: bool = Field(
+        default=False,
+        description="Fire a second request at another source when a raw getter is slow.",
+    )
+    hedge_delay: Optional[float] = Field(
+        default=None,
+        description="Seconds to wait before hedging.  None uses the observed p90 "
+        "latency of the source.",
+    )
+    rate_limit: Optional[RateLimit] = Field(
+        default=None,
+        description="Rate limit applied to every host.  None disables rate limiting.",
+    )
+    rate_limits: Dict[str, RateLimit] = Field(
+        default_factory=dict,
+        description="Rate limits for specific hosts, keyed by base path.  "
+        "These take priority over rate_limit.",
+    )
+    hooks: List[Callable[[Any], None]] = Field(
+        default_factory=list,
+        exclude=True,
+        description="Called with a RequestRecord after every request that reached "
+        "the network.  See hd2api.services.service_hooks for the built in "
+        "LoggingHook and HistogramHook.",
+    )
+    coalesce: bool = Field(
+        default=False,
+        description="Share one in-flight request between concurrent identical calls.",
+    )
+    json_backend: Literal["auto", "orjson", "msgspec", "json", "pydantic"] = Field(
+        default="auto",
+        description="Decoder for response bodies.  'auto' uses orjson or msgspec "
+        "when installed, falling back to the standard library.  'pydantic' has "
+        "pydantic validate single objects straight from the raw response bytes.",
+    )
+    news_cursor: bool = Field(
+        default=False,
+        description="Have the *All getters remember the news feed between calls, "
+        "requesting only items published since the newest one seen.",
+    )
+    cache_enabled: bool = Field(
+        default=False,
+        description="Cache built objects in memory, according to cache_ttls.",
+    )
+    cache_ttls: Dict[str, Optional[float]] = Field(
+        default_factory=lambda: dict(DEFAULT_CACHE_TTLS),
+        description="Seconds to cache the result of each endpoint for, keyed by the "
+        "name of the model it returns.  None caches forever, 0 disables caching.",
+    )
+    cache_default_ttl: Optional[float] = Field(
+        default=10,
+        description="Seconds to cache models missing from cache_ttls for.",
+    )
+    cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Approximate memory cap of the cache, by response body size.",
+    )
+
+    _session: Optional["APISession"] = PrivateAttr(default=None)
+
+    def get_session(self) -> "APISession":
+        """
+        Get the session holding this config's pooled clients, creating it if needed.
+
+        If a setting the session was built with, such as the timeout or the
+        transport, was changed since, the old session is closed and replaced.
+        Safe to call from several threads, as blocking mode does.
+        """
+        from .services.service_session import APISession
+
+        session = self._session
+        if session is not None and session.settings == APISession.settings_of(self):
+            return session
+        with _session_lock:
+            if self._session is not None:
+                if self._session.settings == APISession.settings_of(self):
+                    return self._session
+                self._session.close()
+            self._session = APISession(self)
+            return self._session
+
+    def get_rate_limit(self, base_path: str) -> Optional[RateLimit]:
+        """Get the rate limit that applies to requests sent to base_path."""
+        return self.rate_limits.get(base_path, self.rate_limit)
+
+    def get_cache_ttl(self, model_name: str) -> Optional[float]:
+        """Get the seconds the result of an endpoint returning model_name is cached for."""
+        return self.cache_ttls.get(model_name, self.cache_default_ttl)
+
+    async def aclose(self) -> None:
+        """Close the pooled clients used by this config."""
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+
+    def close(self) -> None:
+        """Close the pooled clients used by this config, from synchronous code."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __copy__(self) -> "APIConfig":
+        # A copy gets a session of its own, built from its own settings.
+        copied = super().__copy__()
+        copied._session = None
+        return copied
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "APIConfig":
+        session, self._session = self._session, None
+        try:
+            return super().__deepcopy__(memo)
+        finally:
+            self._session = session
+
+    async def __aenter__(self) -> "APIConfig":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def __enter__(self) -> "APIConfig":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def staticdata(self) -> StaticAll:
         """If not already present, build up the model of static data."""
@@ -79,6 +362,25 @@ class APIConfig(BaseModel):
         self.__access_token = value
 
 
+_default_config: Optional[APIConfig] = None
+
+
+def get_default_config() -> APIConfig:
+    """
+    Get the config used by getters called without one.
+
+    It is created once and shared, so its pooled clients are reused rather
+    than a new connection pool being opened, and left open, on every call.
+    """
+    global _default_config
+    if _default_config is None:
+        with _session_lock:
+            if _default_config is None:
+                _default_config = APIConfig()
+                atexit.register(_default_config.close)
+    return _default_config
+
+
 class HTTPException(Exception):
     def __init__(self, status_code: int, message: str):
         self.status_code = status_code
@@ -1,6 +1,8 @@
 from .assignment_builder import build_all_assignments
+from .batch_builder import SnapshotBuild, build_snapshot, build_snapshots
 from .campaign_builder import build_all_campaigns, build_campaign
 from .effect_builder import build_planet_effect
+from .incremental_builder import rebuild_all_planets
 from .planet_builder import (
     build_all_planets,
     build_planet_2,
@@ -11,24 +13,37 @@ from .planet_builder import (
 from .region_builder import (
     build_region,
     build_all_regions,
+    build_planet_regions,
 )
 from .sector_state_builder import sector_states
+from .snapshot_index import SnapshotIndex, get_snapshot_index
+from .static_table import ResolvedPlanetStatic, StaticTable, get_static_table
 from .statistics_builder import statistics_builder
 from .war_builder import build_war
 
 __all__ = [
     "build_all_assignments",
+    "SnapshotBuild",
+    "build_snapshot",
+    "build_snapshots",
     "build_all_campaigns",
     "build_campaign",
     "build_planet_effect",
     "build_all_planets",
+    "rebuild_all_planets",
     "build_planet_2",
     "build_planet_basic",
     "build_region",
     "build_all_regions",
+    "build_planet_regions",
     "get_time",
     "get_time_dh",
     "sector_states",
+    "SnapshotIndex",
+    "get_snapshot_index",
+    "ResolvedPlanetStatic",
+    "StaticTable",
+    "get_static_table",
     "statistics_builder",
     "build_war",
 ]
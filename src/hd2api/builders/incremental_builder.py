@@ -0,0 +1,160 @@
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+from ..models import DiveharderAll, Planet, StaticAll, WarInfo, WarStatus, WarSummary
+from .planet_builder import build_planet_full
+from .region_builder import build_planet_regions
+from .snapshot_index import SnapshotIndex, get_snapshot_index
+
+
+# Values fingerprint has to look into.
+_NESTED = (BaseModel, list, dict)
+_SCALARS = (int, float, str, bool, type(None))
+
+# Per model class, a getter for the fields that always hold a plain value
+# and the names of the fields that may need fingerprinting themselves.
+_layouts: Dict[type, Tuple[Callable[[Dict[str, Any]], Any], Tuple[str, ...]]] = {}
+
+
+def _is_scalar(annotation: Any) -> bool:
+    if annotation in _SCALARS:
+        return True
+    if get_origin(annotation) is Union:
+        return all(arg in _SCALARS for arg in get_args(annotation))
+    return False
+
+
+def _layout(cls: type) -> Tuple[Callable[[Dict[str, Any]], Any], Tuple[str, ...]]:
+    layout = _layouts.get(cls)
+    if layout is None:
+        fields = [name for name in cls.model_fields if name != "retrieved_at"]
+        scalars = [n for n in fields if _is_scalar(cls.model_fields[n].annotation)]
+        nested = tuple(n for n in fields if n not in scalars)
+        # itemgetter of a single key doesn't return a tuple.
+        getter = itemgetter(*scalars, *scalars[:1]) if scalars else (lambda d: ())
+        layout = _layouts[cls] = (getter, nested)
+    return layout
+
+
+def fingerprint(value: Any) -> Hashable:
+    """
+    Get a hashable summary of a raw api value, ignoring retrieved_at, so
+    records of two snapshots compare equal when their data didn't change.
+
+    Field names are left out, so only fingerprints of the same model compare.
+    """
+    if isinstance(value, BaseModel):
+        getter, nested = _layout(type(value))
+        data = value.__dict__
+        items = [getter(data)]
+        for name in nested:
+            item = data[name]
+            items.append(fingerprint(item) if isinstance(item, _NESTED) else item)
+        if value.__pydantic_extra__:
+            items.append(fingerprint(value.__pydantic_extra__))
+        return tuple(items)
+    if isinstance(value, list):
+        return tuple(
+            [fingerprint(item) if isinstance(item, _NESTED) else item for item in value]
+        )
+    if isinstance(value, dict):
+        return tuple(
+            [
+                (key, fingerprint(item) if isinstance(item, _NESTED) else item)
+                for key, item in value.items()
+            ]
+        )
+    return value
+
+
+def planet_fingerprint(planetIndex: int, index: SnapshotIndex) -> Hashable:
+    """
+    Summarize every raw record a planet is built from.
+
+    Args:
+        planetIndex (int): The index of the planet.
+        index (SnapshotIndex): Lookup tables over the snapshot.
+
+    Returns:
+        Hashable: Equal for two snapshots only if the planet would be built the same.
+    """
+    region_infos = index.region_infos_by_planet.get(planetIndex, [])
+    return (
+        fingerprint(index.status_by_planet.get(planetIndex)),
+        fingerprint(index.event_by_planet.get(planetIndex)),
+        fingerprint(index.info_by_planet.get(planetIndex)),
+        fingerprint(index.stats_by_planet.get(planetIndex)),
+        tuple(index.effects_by_planet.get(planetIndex, [])),
+        tuple(index.attacks_by_source.get(planetIndex, [])),
+        fingerprint(region_infos),
+        tuple(
+            fingerprint(index.region_status.get((r.planetIndex, r.regionIndex)))
+            for r in region_infos
+        ),
+    )
+
+
+def rebuild_all_planets(
+    previous: Optional[Dict[int, Planet]],
+    warall: DiveharderAll,
+    statics: StaticAll,
+) -> Dict[int, Planet]:
+    """
+    Build every planet of a new snapshot, reusing the planets of the
+    previous build whose raw records didn't change.
+
+    Each planet built here remembers what it was built from, so only
+    planets of a previous rebuild_all_planets call can be reused; on the
+    first call, every planet is built.  Planets with an event are always
+    rebuilt, as the event's times depend on the time of the snapshot, and
+    so are planets whose event ended since the previous snapshot.
+
+    The result matches build_all_planets, except that reused planets keep
+    the retrieved_at times of the snapshot they were built from.
+
+    Args:
+        previous (Optional[Dict[int, Planet]]): The last result of
+            rebuild_all_planets, built with the same statics.
+        warall (DiveharderAll): The new snapshot.
+        statics (StaticAll): Static information about the game's universe.
+
+    Returns:
+        Dict[int, Planet]: A dictionary mapping planet indices to Planet objects.
+    """
+    status: WarStatus = warall.status  # type: ignore
+    info: WarInfo = warall.war_info  # type: ignore
+    summary: Optional[WarSummary] = warall.planet_stats
+    index = get_snapshot_index(warall)
+    previous = previous or {}
+
+    planet_data: Dict[int, Planet] = {}
+    for infov in info.planetInfos:
+        i = infov.index
+        key = planet_fingerprint(i, index)
+        old = previous.get(i, None)
+        if (
+            old is not None
+            and old._source_fingerprint == key
+            and i not in index.event_by_planet
+        ):
+            planet_data[i] = old
+            continue
+        regions = build_planet_regions(i, warall, statics, index)
+        planet = build_planet_full(
+            i, status, info, summary, statics, regions=regions, index=index
+        )
+        planet._source_fingerprint = key
+        planet_data[i] = planet
+    return planet_data
@@ -20,9 +20,10 @@ from ..models import (
     WarSummary,
     PlanetStatic,
 )
-from ..util import get_item
 from .effect_builder import build_planet_effect
-from .region_builder import build_all_regions
+from .region_builder import build_all_regions, build_planet_regions
+from .snapshot_index import SnapshotIndex, get_snapshot_index
+from .static_table import ResolvedPlanetStatic, get_static_table
 from .statistics_builder import statistics_builder
 
 
@@ -260,8 +261,8 @@ def build_planet_basic(
         Planet: The newly constructed Planet object or None if the planet
         doesn't exist in the provided galaxy static information.
     """
-    planet_base = gstatic.planets.get(index, None)
-    if not planet_base:
+    resolved = get_static_table(gstatic).planets.get(index, None)
+    if resolved is None:
         # If a planet doesn't exist for whatever reason, generate
         # a temporary name for it.
         thishash = int(planetInfo.settingsHash)
@@ -292,11 +293,8 @@ def build_planet_basic(
             weather_effects=["normal_temp"],
             type="none",
         )
+        resolved = ResolvedPlanetStatic(gstatic, planet_base)
 
-    biome = gstatic.biomes.get(planet_base.biome, None)  # type: ignore
-    env = [gstatic.environmentals.get(e, None) for e in planet_base.environmentals]
-    weather = [gstatic.environmentals.get(e, None) for e in planet_base.weather_effects]
-    env.extend(weather)
     # Build Statistics
     stats_new = statistics_builder(
         stats, planetStatus.players, planetStatus.retrieved_at
@@ -305,16 +303,13 @@ def build_planet_basic(
     pos = planetInfo.position
     if planetStatus.position is not None:
         pos = planetStatus.position
-    name = planet_base.name
-    if "en-US" in planet_base.names:  # type: ignore
-        name = planet_base.names.get("en-US", planet_base.name)
     planet = Planet(
         retrieved_at=planetStatus.retrieved_at,
         index=index,
-        name=name,
-        sector=planet_base.sector,
-        biome=biome,
-        hazards=env,
+        name=resolved.name,
+        sector=resolved.sector,
+        biome=resolved.biome,
+        hazards=list(resolved.hazards),
         hash=planetInfo.settingsHash,
         position=Position(x=pos.x, y=pos.y),
         waypoints=planetInfo.waypoints,
@@ -377,6 +372,7 @@ def build_planet_full(
     summary: WarSummary,
     statics: StaticAll,
     regions: Optional[List[Region]] = None,
+    index: Optional[SnapshotIndex] = None,
 ) -> Planet:
     """
     Constructs a Planet object for a given planetIndex by associating the respective
@@ -390,22 +386,23 @@ def build_planet_full(
         info (WarInfo): Information related to the ongoing war.
         summary (WarSummary): Summary statistics and data associated with the war.
         statics (StaticAll): Static game universe information.
+        regions (Optional[List[Region]]): Built regions, of which those of this
+            planet are attached to it.
+        index (Optional[SnapshotIndex]): Lookup tables over status, info and summary.
+            Pass the same index when building many planets of one snapshot,
+            otherwise one is built for this call.
 
     Returns:
         Planet: The constructed Planet object for the specified index.
     """
+    if index is None:
+        index = SnapshotIndex(status, info, summary)
 
     # Get planet status & planet info
-    planetStatus: PlanetStatus = get_item(status.planetStatus, index=planetIndex)
-    planetInfo: PlanetInfo = get_item(info.planetInfos, index=planetIndex)
-    if summary.planets_stats is not None:
-        planetStatistics = get_item(
-            summary.planets_stats,
-            planetIndex=planetIndex,
-        )
-        if not planetStatistics:
-            planetStatistics = PlanetStats(planetIndex=planetIndex)
-    else:
+    planetStatus: PlanetStatus = index.status_by_planet.get(planetIndex)  # type: ignore
+    planetInfo: PlanetInfo = index.info_by_planet.get(planetIndex)  # type: ignore
+    planetStatistics = index.stats_by_planet.get(planetIndex, None)
+    if not planetStatistics:
         planetStatistics = PlanetStats(planetIndex=planetIndex)
 
     # Build Planet.
@@ -414,29 +411,20 @@ def build_planet_full(
     )
     planet.sector_id = planetInfo.sector  # type: ignore
 
-    planet_effect_list = []
-    planet_attack_list = []
-
     # Build Effects
-    for effect in status.planetActiveEffects:
-        if effect.index == planetIndex:
-            effects = build_planet_effect(statics.effectstatic, effect.galacticEffectId)
-            planet_effect_list.append(effects)
-
-    planet.activePlanetEffects = planet_effect_list
+    planet.activePlanetEffects = [
+        build_planet_effect(statics.effectstatic, effect_id)
+        for effect_id in index.effects_by_planet.get(planetIndex, [])
+    ]
 
     # Build Attacks
-    for attack in status.planetAttacks:
-        if attack.source == planetIndex:
-            planet_attack_list.append(attack.target)
-
-    planet.attacking = planet_attack_list
+    planet.attacking = list(index.attacks_by_source.get(planetIndex, []))
 
     # Build Events
-    event: PlanetEvent = get_item(status.planetEvents, planetIndex=planetIndex)  # type: ignore
+    event: Optional[PlanetEvent] = index.event_by_planet.get(planetIndex, None)
 
-    starttime = get_time(status, info)
     if event:
+        starttime = index.start_time
         newevent = Event(
             retrieved_at=event.retrieved_at,
             id=event.id,
@@ -454,13 +442,13 @@ def build_planet_full(
 
     # Add Regions
     planet.regions = []
-    if regions:
-        for r in regions:
-            if r.planetIndex == planet.index:
-                if r.owner is None:
-                    r.owner = faction_names.get(planetStatus.owner, "???")
+    for r in regions or []:
+        if r.planetIndex != planet.index:
+            continue
+        if r.owner is None:
+            r.owner = faction_names.get(planetStatus.owner, "???")
 
-                planet.regions.append(r)
+        planet.regions.append(r)
 
     return planet
 
@@ -471,6 +459,10 @@ def build_planet_2(planetIndex: int, warall: DiveharderAll, statics: StaticAll):
     PlanetStatus, PlanetInfo, PlanetStats, PlanetEffects, PlanetAttacks, and
     PlanetEvents from a DiveharderAll object and the static galaxy details.
 
+    Only the regions of this planet are built, and the SnapshotIndex of
+    warall is kept on it, so building planets of the same snapshot one at a
+    time doesn't index it again.
+
     Args:
         planetIndex (int): The index of the planet to be constructed.
         warall (DiveharderAll): Operational game state and status data.
@@ -483,9 +475,10 @@ def build_planet_2(planetIndex: int, warall: DiveharderAll, statics: StaticAll):
     info: WarInfo = warall.war_info  # type: ignore
     summary: Optional[WarSummary] = warall.planet_stats
 
-    regions = build_all_regions(warall, statics)
+    index = get_snapshot_index(warall)
+    regions = build_planet_regions(planetIndex, warall, statics, index)
     planet = build_planet_full(
-        planetIndex, status, info, summary, statics, regions=regions
+        planetIndex, status, info, summary, statics, regions=regions, index=index
     )
     return planet
 
@@ -493,7 +486,10 @@ def build_planet_2(planetIndex: int, warall: DiveharderAll, statics: StaticAll):
 def build_all_planets(warall: DiveharderAll, statics: StaticAll) -> Dict[int, Planet]:
     """
     Builds a dictionary of all planets by iterating over the galaxy's static planet data
-    and invoking build_planet_2 for each planet.
+    and invoking build_planet_full for each planet.
+
+    Every planet is built from a single SnapshotIndex, so building the whole
+    galaxy is linear in the number of planets.
 
     Args:
         warall (DiveharderAll): Operational game state and status data.
@@ -506,10 +502,21 @@ def build_all_planets(warall: DiveharderAll, statics: StaticAll) -> Dict[int, Pl
     status: WarStatus = warall.status  # type: ignore
     info: WarInfo = warall.war_info  # type: ignore
     summary: Optional[WarSummary] = warall.planet_stats
-    regions = build_all_regions(warall, statics)
+    index = get_snapshot_index(warall)
+    regions_by_planet: Dict[int, List[Region]] = {}
+    for region in build_all_regions(warall, statics, index):
+        regions_by_planet.setdefault(region.planetIndex, []).append(region)
     for infov in warall.war_info.planetInfos:
         i = infov.index
-        planet = build_planet_full(i, status, info, summary, statics, regions=regions)
+        planet = build_planet_full(
+            i,
+            status,
+            info,
+            summary,
+            statics,
+            regions=regions_by_planet.get(i, []),
+            index=index,
+        )
         planet_data[i] = planet
 
     return planet_data
@@ -1,12 +1,12 @@
 import datetime as dt
-from typing import Dict, List, Optional, Any
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..constants import faction_names, region_size_enums
 from ..models import (
     DiveharderAll,
     Event,
     GalaxyStatic,
-    PlanetStatic,
     Planet,
     PlanetEvent,
     PlanetInfo,
@@ -24,6 +24,8 @@ from ..models import (
 )
 from ..util import get_item
 from .effect_builder import build_planet_effect
+from .snapshot_index import SnapshotIndex, get_snapshot_index
+from .static_table import get_static_table
 from .statistics_builder import statistics_builder
 
 
@@ -44,24 +46,18 @@ def build_region(
     if statics.galaxystatic is None or statics.galaxystatic.planetRegion is None:
         return None
     index = region_info.planetIndex if region_info.planetIndex is not None else -1
-    planet_base = statics.galaxystatic.planets.get(
-        index, PlanetStatic(name="UNKNOWN PLANET")
-    )
-    if not planet_base:
-        return None
+    resolved = get_static_table(statics.galaxystatic).planets.get(index, None)
     if region_info.settingsHash in statics.galaxystatic.planetRegion:
         static_region = statics.galaxystatic.planetRegion[region_info.settingsHash]
     else:
         static_region = PlanetRegionStatic(name="UNNAMED", description="NoDescription")
     if not static_region:
         return None
-    pname = planet_base.name
-    if "en-US" in planet_base.names:  # type: ignore
-        pname = planet_base.names.get("en-US", planet_base.name)
+    pname = resolved.name if resolved is not None else "UNKNOWN PLANET"
 
     keycombo = f"{region_info.planetIndex}_{region_info.regionIndex}"
-    # Hash the keycombo into a 32-bit integer
-    keycombo_hash = hash(keycombo) & 0xFFFFFFFF
+    # Hash the keycombo into a 32-bit integer, the same in every process.
+    keycombo_hash = zlib.crc32(keycombo.encode("utf-8"))
     return Region(
         # From PlanetRegionInfo
         planetIndex=region_info.planetIndex,
@@ -92,34 +88,28 @@ def build_region(
     )
 
 
-def build_all_regions(warall: DiveharderAll, statics: StaticAll) -> List[Region]:
+def merge_regions(
+    region_infos: List[PlanetRegionInfo],
+    status_lookup: Dict[Tuple[int, int], PlanetRegion],
+    statics: StaticAll,
+) -> List[Region]:
     """
-    Merges all PlanetRegion and PlanetRegionInfo entries into Region objects.
+    Merge each PlanetRegionInfo with its PlanetRegion into a Region object.
+
+    Regions without a PlanetRegion are built as unowned and unavailable.
+
+    Args:
+        region_infos (List[PlanetRegionInfo]): The regions to build.
+        status_lookup (Dict[Tuple[int, int], PlanetRegion]): PlanetRegion by
+            planet and region index.
+        statics (StaticAll): Static information about the game's universe.
 
     Returns:
-        List[Region]: All fully merged region statuses.
+        List[Region]: The merged regions.
     """
     result = []
-    if (
-        warall.status is None
-        or warall.war_info is None
-        or warall.status.planetRegions is None
-        or warall.war_info.planetRegions is None
-    ):
-        print("NOTHING!")
-        raise Exception(
-            "Tried to build all regions when either status.planetRegions or war_info.planetRegions was empty!"
-        )
-        return result
-
-    # Index PlanetRegionInfo by (planetIndex, regionIndex)
-    status_lookup = {
-        f"{info.planetIndex}_{info.regionIndex}": info
-        for info in warall.status.planetRegions
-    }
-
-    for region in warall.war_info.planetRegions:
-        key = f"{region.planetIndex}_{region.regionIndex}"
+    for region in region_infos:
+        key = (region.planetIndex, region.regionIndex)
         region_info = status_lookup.get(key)
         if region_info:
             status = build_region(region_info, region, statics)
@@ -141,3 +131,64 @@ def build_all_regions(warall: DiveharderAll, statics: StaticAll) -> List[Region]
                 result.append(status)
 
     return result
+
+
+def check_regions(warall: DiveharderAll) -> None:
+    """Raise if warall is missing the region lists regions are built from."""
+    if (
+        warall.status is None
+        or warall.war_info is None
+        or warall.status.planetRegions is None
+        or warall.war_info.planetRegions is None
+    ):
+        raise Exception(
+            "Tried to build all regions when either status.planetRegions or war_info.planetRegions was empty!"
+        )
+
+
+def build_all_regions(
+    warall: DiveharderAll,
+    statics: StaticAll,
+    index: Optional[SnapshotIndex] = None,
+) -> List[Region]:
+    """
+    Merges all PlanetRegion and PlanetRegionInfo entries into Region objects.
+
+    Args:
+        warall (DiveharderAll): Operational game state and status data.
+        statics (StaticAll): Static information about the game's universe.
+        index (Optional[SnapshotIndex]): Lookup tables over warall, if already built.
+
+    Returns:
+        List[Region]: All fully merged region statuses.
+    """
+    check_regions(warall)
+    if index is None:
+        index = get_snapshot_index(warall)
+    return merge_regions(warall.war_info.planetRegions, index.region_status, statics)
+
+
+def build_planet_regions(
+    planetIndex: int,
+    warall: DiveharderAll,
+    statics: StaticAll,
+    index: Optional[SnapshotIndex] = None,
+) -> List[Region]:
+    """
+    Merges the PlanetRegion and PlanetRegionInfo entries of a single planet
+    into Region objects, without building the regions of any other planet.
+
+    Args:
+        planetIndex (int): The index of the planet.
+        warall (DiveharderAll): Operational game state and status data.
+        statics (StaticAll): Static information about the game's universe.
+        index (Optional[SnapshotIndex]): Lookup tables over warall, if already built.
+
+    Returns:
+        List[Region]: The fully merged regions of the planet.
+    """
+    check_regions(warall)
+    if index is None:
+        index = get_snapshot_index(warall)
+    region_infos = index.region_infos_by_planet.get(planetIndex, [])
+    return merge_regions(region_infos, index.region_status, statics)
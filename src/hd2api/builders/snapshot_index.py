@@ -0,0 +1,130 @@
+import datetime as dt
+from typing import Dict, List, Optional, Tuple
+
+from ..models import (
+    DiveharderAll,
+    PlanetEvent,
+    PlanetInfo,
+    PlanetRegion,
+    PlanetRegionInfo,
+    PlanetStats,
+    PlanetStatus,
+    WarInfo,
+    WarStatus,
+    WarSummary,
+)
+
+
+class SnapshotIndex:
+    """
+    Lookup tables over a single snapshot of the war, built once so the
+    builders can find everything about a planet by its index, instead of
+    scanning every list in the snapshot once per planet.
+
+    Where a list holds more than one entry for a key, the first one wins, as
+    it did with get_item, except for region statuses, where the last one does.
+
+    Args:
+        status (WarStatus): The war status of the snapshot.
+        info (WarInfo): The war info of the snapshot.
+        summary (Optional[WarSummary]): The war summary of the snapshot.
+
+    Attributes:
+        status_by_planet (Dict[int, PlanetStatus]): PlanetStatus by planet index.
+        info_by_planet (Dict[int, PlanetInfo]): PlanetInfo by planet index.
+        stats_by_planet (Dict[int, PlanetStats]): PlanetStats by planet index.
+        event_by_planet (Dict[int, PlanetEvent]): PlanetEvent by planet index.
+        effects_by_planet (Dict[int, List[int]]): Active galacticEffectIds by
+            planet index.
+        attacks_by_source (Dict[int, List[int]]): Planets attacked by each planet index.
+        region_status (Dict[Tuple[int, int], PlanetRegion]): PlanetRegion by
+            planet and region index.
+        region_infos_by_planet (Dict[int, List[PlanetRegionInfo]]): The
+            PlanetRegionInfo of every region of each planet index.
+    """
+
+    def __init__(
+        self,
+        status: WarStatus,
+        info: WarInfo,
+        summary: Optional[WarSummary] = None,
+    ):
+        self.status = status
+        self.info = info
+        self.summary = summary
+        self.status_by_planet: Dict[int, PlanetStatus] = {}
+        for planet_status in status.planetStatus or []:
+            self.status_by_planet.setdefault(planet_status.index, planet_status)
+        self.info_by_planet: Dict[int, PlanetInfo] = {}
+        for planet_info in info.planetInfos or []:
+            self.info_by_planet.setdefault(planet_info.index, planet_info)
+        self.stats_by_planet: Dict[int, PlanetStats] = {}
+        if summary is not None and summary.planets_stats is not None:
+            for stats in summary.planets_stats:
+                self.stats_by_planet.setdefault(stats.planetIndex, stats)
+        self.event_by_planet: Dict[int, PlanetEvent] = {}
+        for event in status.planetEvents or []:
+            self.event_by_planet.setdefault(event.planetIndex, event)
+        self.effects_by_planet: Dict[int, List[int]] = {}
+        for effect in status.planetActiveEffects or []:
+            self.effects_by_planet.setdefault(effect.index, []).append(
+                effect.galacticEffectId
+            )
+        self.attacks_by_source: Dict[int, List[int]] = {}
+        for attack in status.planetAttacks or []:
+            self.attacks_by_source.setdefault(attack.source, []).append(attack.target)
+        self.region_status: Dict[Tuple[int, int], PlanetRegion] = {
+            (region_status.planetIndex, region_status.regionIndex): region_status
+            for region_status in status.planetRegions or []
+        }
+        self.region_infos_by_planet: Dict[int, List[PlanetRegionInfo]] = {}
+        for region_info in info.planetRegions or []:
+            self.region_infos_by_planet.setdefault(region_info.planetIndex, []).append(
+                region_info
+            )
+        self._start_time: Optional[dt.datetime] = None
+
+    @classmethod
+    def from_warall(cls, warall: DiveharderAll) -> "SnapshotIndex":
+        """Index the status, war info and planet stats of a DiveharderAll."""
+        status: WarStatus = warall.status  # type: ignore
+        info: WarInfo = warall.war_info  # type: ignore
+        return cls(status, info, warall.planet_stats)
+
+    def indexes(self, warall: DiveharderAll) -> bool:
+        """If this index was made from the current parts of warall."""
+        return (
+            self.status is warall.status
+            and self.info is warall.war_info
+            and self.summary is warall.planet_stats
+        )
+
+    @property
+    def start_time(self) -> dt.datetime:
+        """The relative start of the war, see get_time.  Computed once."""
+        if self._start_time is None:
+            from .planet_builder import get_time
+
+            self._start_time = get_time(self.status, self.info)
+        return self._start_time
+
+
+def get_snapshot_index(warall: DiveharderAll) -> SnapshotIndex:
+    """
+    Get the SnapshotIndex of warall, building it on first use.
+
+    The index is kept on warall, so repeated builds from the same snapshot
+    share it.  It's rebuilt if the status, war_info or planet_stats of
+    warall were replaced since, but lists changed in place aren't noticed.
+
+    Args:
+        warall (DiveharderAll): The snapshot to index.
+
+    Returns:
+        SnapshotIndex: The index of warall.
+    """
+    index = warall._snapshot_index
+    if index is None or not index.indexes(warall):
+        index = SnapshotIndex.from_warall(warall)
+        warall._snapshot_index = index
+    return index
@@ -0,0 +1,95 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models import Biome, GalaxyStatic, Hazard, PlanetStatic
+
+
+class ResolvedPlanetStatic:
+    """
+    The static attributes of one planet, looked up in a GalaxyStatic.
+
+    Args:
+        gstatic (GalaxyStatic): The static information the planet is resolved in.
+        planet_base (PlanetStatic): The planet's own static data.
+
+    Attributes:
+        name (Optional[str]): The planet's display name, in en-US if known.
+        names (Dict[str, str]): The planet's display name in every known language.
+        sector (Optional[str]): The name of the planet's sector.
+        biome (Optional[Biome]): The planet's biome, if known.
+        hazards (List[Optional[Hazard]]): The planet's environmental effects,
+            followed by its weather effects.
+    """
+
+    def __init__(self, gstatic: GalaxyStatic, planet_base: PlanetStatic):
+        environmentals = gstatic.environmentals or {}
+        self.names: Dict[str, str] = dict(planet_base.names or {})
+        self.name: Optional[str] = self.names.get("en-US", planet_base.name)
+        self.sector: Optional[str] = planet_base.sector
+        self.biome: Optional[Biome] = (gstatic.biomes or {}).get(
+            planet_base.biome, None  # type: ignore
+        )
+        self.hazards: List[Optional[Hazard]] = [
+            environmentals.get(e, None) for e in planet_base.environmentals or []
+        ]
+        self.hazards.extend(
+            environmentals.get(e, None) for e in planet_base.weather_effects or []
+        )
+
+
+class StaticTable:
+    """
+    The resolved static attributes of every planet in a GalaxyStatic, so
+    builders don't look up the same biome, hazards and names again for
+    every planet of every snapshot.
+
+    Args:
+        gstatic (GalaxyStatic): The static information to resolve.
+
+    Attributes:
+        planets (Dict[int, ResolvedPlanetStatic]): Resolved statics by planet index.
+    """
+
+    def __init__(self, gstatic: GalaxyStatic):
+        self.gstatic = gstatic
+        # Held on to, so they can't be collected and their ids reused.
+        self.sources = self.sources_of(gstatic)
+        self.planets: Dict[int, ResolvedPlanetStatic] = {
+            index: ResolvedPlanetStatic(gstatic, planet_base)
+            for index, planet_base in (gstatic.planets or {}).items()
+        }
+
+    @staticmethod
+    def sources_of(gstatic: GalaxyStatic) -> Tuple[Any, Any, Any]:
+        """The static tables a StaticTable is resolved from."""
+        return (gstatic.planets, gstatic.biomes, gstatic.environmentals)
+
+    def resolves(self, gstatic: GalaxyStatic) -> bool:
+        """
+        Check if this table was resolved from gstatic as it is now.
+
+        Replacing the planets, biomes or environmentals of gstatic is noticed,
+        but changes to their entries in place aren't.
+        """
+        return gstatic is self.gstatic and all(
+            old is new for old, new in zip(self.sources, self.sources_of(gstatic))
+        )
+
+
+def get_static_table(gstatic: GalaxyStatic) -> StaticTable:
+    """
+    Get the StaticTable of gstatic, resolving it on first use.
+
+    The table is kept on gstatic, and resolved again once gstatic's
+    tables are replaced, see StaticTable.resolves.
+
+    Args:
+        gstatic (GalaxyStatic): The static information to resolve.
+
+    Returns:
+        StaticTable: The table of gstatic.
+    """
+    table = gstatic._static_table
+    if table is None or not table.resolves(gstatic):
+        table = StaticTable(gstatic)
+        gstatic._static_table = table
+    return table
@@ -1,8 +1,41 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Set
+from typing import Any, Iterator, Optional, Set
 
 # pylint: disable=no-name-in-module
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+_retrieved_at: ContextVar[Optional[datetime]] = ContextVar(
+    "hd2api_retrieved_at", default=None
+)
+
+
+def _default_retrieved_at() -> datetime:
+    return _retrieved_at.get() or datetime.now(tz=timezone.utc)
+
+
+@contextmanager
+def retrieved_at_context(when: Optional[datetime] = None) -> Iterator[datetime]:
+    """
+    Stamp every model created inside this context with the same retrieved_at time.
+
+    Reading the clock once per response rather than once per nested model is
+    noticeably cheaper for large payloads such as WarStatus.
+
+    Args:
+        when (Optional[datetime]): The time to use, defaulting to now.
+
+    Yields:
+        datetime: The retrieved_at time in use.
+    """
+    if when is None:
+        when = datetime.now(tz=timezone.utc)
+    token = _retrieved_at.set(when)
+    try:
+        yield when
+    finally:
+        _retrieved_at.reset(token)
 
 
 class BaseApiModel(BaseModel, extra="allow"):
@@ -11,20 +44,22 @@ class BaseApiModel(BaseModel, extra="allow"):
     model_config = ConfigDict(
         populate_by_name=True,
     )
-    retrieved_at: Optional[datetime] = Field(alias="retrieved_at", default=None)
+    retrieved_at: Optional[datetime] = Field(
+        alias="retrieved_at", default_factory=_default_retrieved_at
+    )
     time_delta: Optional[timedelta] = Field(alias="time_delta", default=None)
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        if "retrieved_at" not in data:
-            self.retrieved_at = datetime.now(tz=timezone.utc)
-        else:
-            if isinstance(data["retrieved_at"], str):
-                self.retrieved_at = datetime.fromisoformat(
-                    data["retrieved_at"]
-                ).replace(tzinfo=timezone.utc)
-            elif isinstance(data["retrieved_at"], datetime):
-                self.retrieved_at = data["retrieved_at"]
+    @field_validator("retrieved_at", mode="before")
+    @classmethod
+    def _parse_retrieved_at(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+        return value
+
+    def model_post_init(self, __context: Any) -> None:
+        # retrieved_at is always filled in, so it always counts as set, and
+        # model_dump(exclude_unset=True) keeps it.
+        self.__pydantic_fields_set__.add("retrieved_at")
 
     def get_time_delta(self, other: "BaseApiModel") -> Optional[timedelta]:
         """
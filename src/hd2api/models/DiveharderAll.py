@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 
 from .ABC.model import BaseApiModel
@@ -67,3 +67,6 @@ class DiveharderAll(BaseApiModel):
         default=None,
         description="List of all episodes.",
     )
+
+    # The SnapshotIndex the builders made of this snapshot, see get_snapshot_index.
+    _snapshot_index: Any = PrivateAttr(default=None)
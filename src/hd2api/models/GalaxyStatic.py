@@ -1,6 +1,6 @@
-from typing import Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, cast
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from .ABC.model import BaseApiModel
 from .Biome import Biome
@@ -122,6 +122,9 @@ class GalaxyStatic(BaseApiModel):
         description="All static planet region data.",
     )
 
+    # The StaticTable the builders resolved from this, see get_static_table.
+    _static_table: Any = PrivateAttr(default=None)
+
 
 class StaticAll(BaseApiModel):
     """All the static models in one package."""
@@ -1,7 +1,7 @@
 import datetime
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from hd2api.models.Region import Region
 
@@ -140,6 +140,9 @@ class Planet(BaseApiModel, HealthMixin):
         description="List of all regions found for this planet.",
     )
 
+    # What the planet was built from, see rebuild_all_planets.
+    _source_fingerprint: Any = PrivateAttr(default=None)
+
     def __sub__(self, other: "Planet") -> "Planet":
         """
         Subtract values from another planet.
@@ -5,6 +5,7 @@ from .async_comm_service import (
     GetCommApiRawAssignment,
     GetCommApiRawNewsFeed,
     GetCommApiRawSpaceStation,
+    GetCommApiRawAll,
     GetApiV1War,
     GetApiV1AssignmentsAll,
     GetApiV1Assignments,
@@ -49,13 +50,13 @@ from .async_raw_service import (
 )
 
 __all__ = [
-    "GetApiV1Campaigns",
     "GetCommApiRawWarStatus",
     "GetCommApiRawWarInfo",
     "GetCommApiRawSummary",
     "GetCommApiRawAssignment",
     "GetCommApiRawNewsFeed",
     "GetCommApiRawSpaceStation",
+    "GetCommApiRawAll",
     "GetApiV1War",
     "GetApiV1AssignmentsAll",
     "GetApiV1Assignments",
@@ -3,7 +3,7 @@ from typing import List, Optional, Type, TypeVar, Union
 
 from hd2api.models import DiveharderAll
 
-from ..api_config import APIConfig, HTTPException
+from ..api_config import APIConfig, get_default_config
 from ..models import (
     Assignment,
     Assignment2,
@@ -19,8 +19,10 @@ from ..models import (
     WarSummary,
 )
 from ..models.ABC.model import BaseApiModel
-from .service_base import make_async_api_request
-from .service_utils import make_output
+from .service_base import make_async_model_request
+from .service_news import fetch_news
+from .service_sync import chain_parts, gather_parts
+from .service_utils import collect_parts
 
 T = TypeVar("T", bound=BaseApiModel)
 
@@ -34,7 +36,7 @@ async def make_comm_v1_api_request(
     api_config_override: Optional[APIConfig] = None,
 ) -> Union[T, List[T]]:
     """Make an API Request for a built object using the Community API Wrapper."""
-    api_config = api_config_override or APIConfig()
+    api_config = api_config_override or get_default_config()
 
     base_path = api_config.api_comm
     path = f"/api/v1/{endpoint}"
@@ -46,9 +48,9 @@ async def make_comm_v1_api_request(
             "Attempted to call community api without setting client_contact"
         )
 
-    data = await make_async_api_request(base_path, path, api_config)
-
-    return make_output(data, model, index)
+    return await make_async_model_request(
+        base_path, path, model, api_config, index=index
+    )
 
 
 async def make_comm_raw_api_request(
@@ -61,7 +63,7 @@ async def make_comm_raw_api_request(
     """
     Get a raw api object from the Community api.
     """
-    api_config = api_config_override or APIConfig()
+    api_config = api_config_override or get_default_config()
 
     base_path = api_config.api_comm
     path = f"/raw/api/{endpoint}"
@@ -73,8 +75,9 @@ async def make_comm_raw_api_request(
             "Attempted to call community api without setting client_contact"
         )
 
-    data = await make_async_api_request(base_path, path, api_config, params)
-    return make_output(data, model, index)
+    return await make_async_model_request(
+        base_path, path, model, api_config, params, index
+    )
 
 
 # Raw Community API Endpoints
@@ -245,22 +248,24 @@ async def GetApiV1Steam2(
 async def GetCommApiRawAll(
     api_config_override: Optional[APIConfig] = None,
 ) -> DiveharderAll:
-    warstatus = await GetCommApiRawWarStatus(api_config_override)
-    warinfo = await GetCommApiRawWarInfo(api_config_override)
-    summary = await GetCommApiRawSummary(api_config_override)
-    assign = await GetCommApiRawAssignment(api_config_override)
-    try:
-        news = await GetCommApiRawNewsFeed(
-            api_config_override, fromTimestamp=warstatus.time - 10000000
-        )
-    except HTTPException as e:
-        hd2api_logger.error("Error raised when calling news feed: %s", e)
-        news = None
-    newdive = DiveharderAll(
-        status=warstatus,
-        war_info=warinfo,
-        planet_stats=summary,
-        major_order=assign,
-        news_feed=news,
+    """
+    Retrieve every raw endpoint from the community api, fetching each part concurrently.
+
+    A part that fails is logged and left as None, so a single failed
+    sub-request yields a partial DiveharderAll.
+    """
+    api_config = api_config_override or get_default_config()
+
+    async def get_news(warstatus: WarStatus) -> List[NewsFeedItem]:
+        return await fetch_news(api_config, "community", GetCommApiRawNewsFeed, warstatus.time)
+
+    names = ["status", "news_feed", "war_info", "planet_stats", "major_order"]
+    chained, *others = await gather_parts(
+        chain_parts(GetCommApiRawWarStatus(api_config), get_news, "status"),
+        GetCommApiRawWarInfo(api_config),
+        GetCommApiRawSummary(api_config),
+        GetCommApiRawAssignment(api_config),
     )
+    results = [*chained, *others]
+    newdive = DiveharderAll(**collect_parts(names, results))
     return newdive
@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional, Type, TypeVar, Union
 
-from ..api_config import APIConfig, HTTPException
+from ..api_config import APIConfig, get_default_config
 from ..models import (
     Assignment,
     DiveharderAll,
@@ -13,8 +13,10 @@ from ..models import (
     WarSummary,
 )
 from ..models.ABC.model import BaseApiModel
-from .service_base import make_async_api_request
-from .service_utils import make_output
+from .service_base import make_async_model_request
+from .service_news import fetch_news
+from .service_sync import chain_parts, gather_parts
+from .service_utils import collect_parts
 
 T = TypeVar("T", bound=BaseApiModel)
 
@@ -31,14 +33,12 @@ async def make_direct_api_request(
     params: Optional[dict] = None,  # Added parameters for GET requests
 ) -> Optional[Union[T, List[T]]]:
     """Get a raw api object directly from arrowhead's api."""
-    api_config = api_config_override or APIConfig()
+    api_config = api_config_override or get_default_config()
 
     base_path = api_config.api_direct
     path = f"/api/{endpoint}"
 
-    data = await make_async_api_request(base_path, path, api_config, params)
-
-    return make_output(data, model, None)
+    return await make_async_model_request(base_path, path, model, api_config, params)
 
 
 async def GetApiDirectWarStatus(
@@ -161,24 +161,33 @@ async def GetApiDirectEpisode(
 async def GetApiDirectAll(
     api_config_override: Optional[APIConfig] = None,
 ) -> DiveharderAll:
-    warstatus = await GetApiDirectWarStatus(api_config_override)
-    warinfo = await GetApiDirectWarInfo(api_config_override)
-    summary = await GetApiDirectSummary(api_config_override)
-    assign = await GetApiDirectAssignment(api_config_override)
-    try:
-        news = await GetApiDirectNewsFeed(
-            api_config_override, fromTimestamp=warstatus.time - 10000000
-        )
-    except HTTPException as e:
-        hd2api_logger.error("Error raised when calling news feed: %s", e)
-        news = None
-    episodes = await GetApiDirectEpisode(api_config_override)
-    newdive = DiveharderAll(
-        status=warstatus,
-        war_info=warinfo,
-        planet_stats=summary,
-        major_order=assign,
-        news_feed=news,
-        episodes=episodes,
+    """
+    Retrieve every raw endpoint at once, fetching each part concurrently.
+
+    A part that fails is logged and left as None, so a single failed
+    sub-request yields a partial DiveharderAll.
+    """
+    api_config = api_config_override or get_default_config()
+
+    async def get_news(warstatus: WarStatus) -> List[NewsFeedItem]:
+        # The news feed is the only request that depends on another.
+        return await fetch_news(api_config, "direct", GetApiDirectNewsFeed, warstatus.time)
+
+    names = [
+        "status",
+        "news_feed",
+        "war_info",
+        "planet_stats",
+        "major_order",
+        "episodes",
+    ]
+    chained, *others = await gather_parts(
+        chain_parts(GetApiDirectWarStatus(api_config), get_news, "status"),
+        GetApiDirectWarInfo(api_config),
+        GetApiDirectSummary(api_config),
+        GetApiDirectAssignment(api_config),
+        GetApiDirectEpisode(api_config),
     )
+    results = [*chained, *others]
+    newdive = DiveharderAll(**collect_parts(names, results))
     return newdive
@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, List, Optional, Type, TypeVar, Union
 
-from ..api_config import APIConfig, HTTPException
+from ..api_config import APIConfig, HTTPException, get_default_config
 from ..models import (
     Assignment,
     DiveharderAll,
@@ -12,8 +12,7 @@ from ..models import (
     WarSummary,
 )
 from ..models.ABC.model import BaseApiModel
-from .service_base import make_async_api_request
-from .service_utils import make_output
+from .service_base import make_async_model_request
 
 T = TypeVar("T", bound=BaseApiModel)
 
@@ -30,13 +29,11 @@ async def make_raw_api_request(
     """
     Get a raw api object from diveharder.
     """
-    api_config = api_config_override or APIConfig()
+    api_config = api_config_override or get_default_config()
 
     base_path = api_config.api_diveharder
     path = f"/raw/{endpoint}"
-    data = await make_async_api_request(base_path, path, api_config, params)
-
-    return make_output(data, model, None)
+    return await make_async_model_request(base_path, path, model, api_config, params)
 
 
 async def GetDhApiRawWarStatus(
@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from typing import List, TypeVar
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
 
 from ..api_config import APIConfig
 from ..models import (
@@ -38,80 +40,251 @@ from .async_diveh_service import (
     GetDhApiRawWarInfo,
     GetDhApiRawWarStatus,
 )
+from .service_sync import is_blocking
 
 T = TypeVar("T", bound=BaseApiModel)
 
 
 hd2api_logger = logging.getLogger("hd2api_logger")
 
+RawGetter = Callable[..., Awaitable[Any]]
+
+# Hedge delay used until a source has enough latency samples for a p90.
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_SAMPLES = 5
+
+# The getter for each raw endpoint, keyed by source name.
+RAW_GETTERS: Dict[str, Dict[str, RawGetter]] = {
+    "WarStatus": {
+        "community": GetCommApiRawWarStatus,
+        "diveharder": GetDhApiRawWarStatus,
+        "direct": GetApiDirectWarStatus,
+    },
+    "WarInfo": {
+        "community": GetCommApiRawWarInfo,
+        "diveharder": GetDhApiRawWarInfo,
+        "direct": GetApiDirectWarInfo,
+    },
+    "Summary": {
+        "community": GetCommApiRawSummary,
+        "diveharder": GetDhApiRawSummary,
+        "direct": GetApiDirectSummary,
+    },
+    "Assignment": {
+        "community": GetCommApiRawAssignment,
+        "diveharder": GetDhApiRawAssignment,
+        "direct": GetApiDirectAssignment,
+    },
+    "NewsFeed": {
+        "community": GetCommApiRawNewsFeed,
+        "diveharder": GetDhApiRawNewsFeed,
+        "direct": GetApiDirectNewsFeed,
+    },
+    "SpaceStation": {
+        "community": GetCommApiRawSpaceStation,
+        "diveharder": GetDhApiRawSpaceStation,
+        "direct": GetApiDirectSpaceStation,
+    },
+    "All": {
+        "community": GetCommApiRawAll,
+        "diveharder": GetDhApiRawAll,
+        "direct": GetApiDirectAll,
+    },
+}
+
+
+async def get_from_raw(endpoint: str, api_config: APIConfig, *args: Any) -> Any:
+    """
+    Call the getter for a raw endpoint from the source selected by api_config.use_raw.
+
+    Args:
+        endpoint (str): The key of the endpoint within RAW_GETTERS.
+        api_config (APIConfig): The configuration to make the request with.
+        *args (Any): Arguments passed to the getter ahead of the config.
+
+    Hedged requests can't be cancelled once a thread is blocked on them, so
+    in blocking mode with api_config.hedge set, sources are tried one after
+    another as in failover mode, starting from use_raw.
+
+    Returns:
+        Any: The result of the getter.
+    """
+    if api_config.hedge and not is_blocking():
+        return await get_with_hedge(endpoint, api_config, *args)
+    if api_config.use_raw == "failover" or api_config.hedge:
+        return await get_with_failover(endpoint, api_config, *args)
+    getter = RAW_GETTERS[endpoint].get(api_config.use_raw, None)
+    if getter is None:
+        return None
+    return await getter(*args, api_config)
+
+
+def failover_sources(endpoint: str, api_config: APIConfig) -> List[str]:
+    """
+    Get the sources that can be tried for an endpoint: use_raw first, unless
+    it is "failover", then the rest, healthiest on that endpoint first.
+
+    Sources whose circuit breaker is open are left out, use_raw included,
+    unless every source's breaker is open.
+    """
+    getters = RAW_GETTERS[endpoint]
+    sources = [
+        source
+        for source in api_config.failover_sources
+        if source in getters
+        # The community api refuses requests without a contact.
+        and (source != "community" or api_config.client_contact is not None)
+    ]
+    if api_config.use_raw in getters and api_config.use_raw not in sources:
+        sources.append(api_config.use_raw)
+    sources = api_config.get_session().health.ranked(sources, endpoint)
+    if api_config.use_raw in sources:
+        sources.remove(api_config.use_raw)
+        sources.insert(0, api_config.use_raw)
+    return sources
+
+
+async def call_source(source: str, endpoint: str, api_config: APIConfig, *args: Any) -> Any:
+    """Call the getter of endpoint on a single source, recording the outcome in its health."""
+    health = api_config.get_session().health.get(source)
+    start = time.perf_counter()
+    try:
+        result = await RAW_GETTERS[endpoint][source](*args, api_config)
+        if result is None or (
+            isinstance(result, DiveharderAll) and result.status is None
+        ):
+            raise ValueError(f"{source} returned no data.")
+    except Exception as e:
+        health.record_failure(api_config.breaker_threshold, api_config.breaker_cooldown)
+        hd2api_logger.warning("Raw source %s failed: %s", source, e)
+        raise
+    health.record_success(endpoint, time.perf_counter() - start)
+    return result
+
+
+async def get_with_failover(endpoint: str, api_config: APIConfig, *args: Any) -> Any:
+    """
+    Try each source in order of its health score until one succeeds, starting
+    from use_raw unless it is "failover".
+
+    Every attempt updates the health of its source, and a source that failed
+    too many times in a row is skipped by its circuit breaker until it cools down.
+
+    Raises:
+        Exception: The last error encountered, if every source failed.
+    """
+    sources = failover_sources(endpoint, api_config)
+    last_error: Exception = ValueError("No raw source is available.")
+    for source in sources:
+        try:
+            return await call_source(source, endpoint, api_config, *args)
+        except Exception as e:
+            last_error = e
+    raise last_error
+
+
+def get_hedge_delay(source: str, endpoint: str, api_config: APIConfig) -> float:
+    """Get the seconds to wait on endpoint of source before firing a hedged request."""
+    if api_config.hedge_delay is not None:
+        return api_config.hedge_delay
+    health = api_config.get_session().health.get(source)
+    if health.sample_count(endpoint) < MIN_HEDGE_SAMPLES:
+        return DEFAULT_HEDGE_DELAY
+    return health.percentile(endpoint, 90) or DEFAULT_HEDGE_DELAY
+
+
+async def get_with_hedge(endpoint: str, api_config: APIConfig, *args: Any) -> Any:
+    """
+    Request from the primary source, and if it hasn't answered within the
+    hedge delay, fire the same request at the next source and take whichever
+    answers first.  The slower request is cancelled.
+
+    The primary source is use_raw, or the healthiest source in failover mode
+    or while use_raw's circuit breaker is open.  A source that fails outright
+    is replaced by the next one immediately.
+
+    Raises:
+        Exception: The last error encountered, if every source failed.
+    """
+    session = api_config.get_session()
+    sources = failover_sources(endpoint, api_config)
+
+    pending: Dict["asyncio.Task[Any]", str] = {}
+    last_error: Exception = ValueError("No raw source is available.")
+    hedged: Optional[str] = None
+
+    def launch() -> None:
+        source = sources.pop(0)
+        task = asyncio.ensure_future(call_source(source, endpoint, api_config, *args))
+        pending[task] = source
+
+    if sources:
+        launch()
+    try:
+        while pending:
+            timeout = None
+            if sources and hedged is None:
+                primary = next(iter(pending.values()))
+                timeout = get_hedge_delay(primary, endpoint, api_config)
+            done: Set["asyncio.Task[Any]"]
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                # The primary is slower than usual, so hedge.
+                hedged = sources[0]
+                session.hedges_fired += 1
+                launch()
+                continue
+            for task in done:
+                source = pending.pop(task)
+                if task.exception() is None:
+                    if source == hedged:
+                        session.hedges_won += 1
+                    return task.result()
+                last_error = task.exception()  # type: ignore
+            if not pending and sources:
+                launch()
+        raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
 
 async def GetApiRawWarStatus(api_config_override: APIConfig) -> WarStatus:
     """Retrieve the raw war status from the default raw api."""
-    if api_config_override.use_raw == "community":
-        return await GetCommApiRawWarStatus(api_config_override)
-    elif api_config_override.use_raw == "diveharder":
-        return await GetDhApiRawWarStatus(api_config_override)
-    elif api_config_override.use_raw == "direct":
-        return await GetApiDirectWarStatus(api_config_override)
+    return await get_from_raw("WarStatus", api_config_override)
 
 
 async def GetApiRawWarInfo(api_config_override: APIConfig) -> WarInfo:
     """Retrieve the additional war info from the default raw api."""
-    if api_config_override.use_raw == "community":
-        return await GetCommApiRawWarInfo(api_config_override)
-    elif api_config_override.use_raw == "diveharder":
-        return await GetDhApiRawWarInfo(api_config_override)
-    elif api_config_override.use_raw == "direct":
-        return await GetApiDirectWarInfo(api_config_override)
+    return await get_from_raw("WarInfo", api_config_override)
 
 
 async def GetApiRawSummary(api_config_override: APIConfig) -> WarSummary:
     """Retrieve the raw war summary from the default raw api."""
-    if api_config_override.use_raw == "community":
-        return await GetCommApiRawSummary(api_config_override)
-    elif api_config_override.use_raw == "diveharder":
-        return await GetDhApiRawSummary(api_config_override)
-    elif api_config_override.use_raw == "direct":
-        return await GetApiDirectSummary(api_config_override)
+    return await get_from_raw("Summary", api_config_override)
 
 
 async def GetApiRawAssignment(api_config_override: APIConfig) -> Assignment:
     """Retrieve the raw assignment from the default raw api."""
-    if api_config_override.use_raw == "community":
-        return await GetCommApiRawAssignment(api_config_override)
-    elif api_config_override.use_raw == "diveharder":
-        return await GetDhApiRawAssignment(api_config_override)
-    elif api_config_override.use_raw == "direct":
-        return await GetApiDirectAssignment(api_config_override)
+    return await get_from_raw("Assignment", api_config_override)
 
 
 async def GetApiRawNewsFeed(api_config_override: APIConfig) -> List[NewsFeedItem]:
     """Retrieve the raw news feed from the default raw api."""
-    if api_config_override.use_raw == "community":
-        return await GetCommApiRawNewsFeed(api_config_override)
-    elif api_config_override.use_raw == "diveharder":
-        return await GetDhApiRawNewsFeed(api_config_override)
-    elif api_config_override.use_raw == "direct":
-        return await GetApiDirectNewsFeed(api_config_override)
+    return await get_from_raw("NewsFeed", api_config_override)
 
 
 async def GetApiRawSpaceStation(
     station_id: int, api_config_override: APIConfig
 ) -> List[NewsFeedItem]:
     """Retrieve the raw news feed from the default raw api."""
-    if api_config_override.use_raw == "community":
-        return await GetCommApiRawSpaceStation(station_id, api_config_override)
-    elif api_config_override.use_raw == "diveharder":
-        return await GetDhApiRawSpaceStation(station_id, api_config_override)
-    elif api_config_override.use_raw == "direct":
-        return await GetApiDirectSpaceStation(station_id, api_config_override)
+    return await get_from_raw("SpaceStation", api_config_override, station_id)
 
 
 async def GetApiRawAll(api_config_override: APIConfig, direct=False) -> DiveharderAll:
     """Retrieve all raw data from the api, optionally using the direct method."""
-    if api_config_override.use_raw == "community":
-        return await GetCommApiRawAll(api_config_override)
-    elif api_config_override.use_raw == "diveharder":
-        return await GetDhApiRawAll(api_config_override)
-    elif api_config_override.use_raw == "direct":
-        return await GetApiDirectAll(api_config_override)
+    return await get_from_raw("All", api_config_override)
@@ -1,10 +1,19 @@
 import logging
-from typing import Any, Optional, TypeVar
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
 import httpx
 
 from ..api_config import APIConfig, HTTPException
 from ..models.ABC.model import BaseApiModel
+from .service_cache import CacheKey, make_cache_key
+from .service_hooks import RequestRecord, emit, new_record
+from .service_json import decode_json
+from .service_metrics import ACCEPT_ENCODING
+from .service_sync import is_blocking, run_blocking, sleep
+from .service_utils import make_output, make_output_from_json, refreshed_copy
 
 T = TypeVar("T", bound=BaseApiModel)
 
@@ -14,77 +23,344 @@ hd2api_logger = logging.getLogger("hd2api_logger")
 hd2api_logger.setLevel(logging.INFO)
 
 
-async def make_async_api_request(
-    base_path: str, path: str, api_config: APIConfig, params: Optional[dict] = None
-) -> Any:
-    """Make a asyncronous request to any endpoint."""
-
+def make_headers(api_config: APIConfig) -> Dict[str, str]:
+    """Build the headers sent with every request."""
     headers = {
         "Content-Type": "application/json",
         "Accept": "application/json",
         "X-Super-Client": f"{api_config.get_client_name()}",
         "Accept-Language": api_config.language,
+        "Accept-Encoding": ACCEPT_ENCODING if api_config.compression else "identity",
     }
     if api_config.client_contact:
         headers["X-Super-Contact"] = api_config.client_contact
-    # Replace WARID in path.
+    return headers
+
+
+def resolve_path(path: str, api_config: APIConfig) -> str:
+    """Replace WARID in path with the current war id."""
     if "WARID" in path:
         path = path.replace("WARID", f"{api_config.warID}")
-    try:
-        async with httpx.AsyncClient(
-            base_url=base_path, verify=api_config.verify, timeout=api_config.timeout
-        ) as client:
-            if params:
-                response = await client.get(
-                    path, headers=headers, params=params
-                )  # Added params to the request
+    return path
+
+
+async def make_async_api_response(
+    base_path: str,
+    path: str,
+    api_config: APIConfig,
+    params: Optional[dict] = None,
+    extra_headers: Optional[Dict[str, str]] = None,
+    record: Optional[RequestRecord] = None,
+) -> httpx.Response:
+    """
+    Make a asyncronous request to any endpoint, and return the response itself.
+
+    A 304 Not Modified response is returned as is, any other status besides 200
+    raises an HTTPException.  The compressed and decompressed size of every
+    response returned is added to the session's byte accounting.
+
+    In blocking mode, see run_blocking, the request is sent with the session's
+    pooled sync client instead, without suspending.
+
+    If a record is given, the timings and outcome of the request are written
+    to it.
+    """
+    headers = make_headers(api_config)
+    if extra_headers:
+        headers.update(extra_headers)
+    endpoint = f"{base_path}{path}"
+    path = resolve_path(path, api_config)
+    blocking = is_blocking()
+    session = api_config.get_session()
+    client: Union[httpx.Client, httpx.AsyncClient] = (
+        session.get_sync_client(base_path)
+        if blocking
+        else session.get_async_client(base_path)
+    )
+    limiter = session.get_rate_limiter(base_path, api_config)
+    attempt = 0
+    extensions = None
+    if record is not None:
+        extensions = {"trace": record.trace if blocking else record.atrace}
+    while True:
+        attempt += 1
+        if limiter is not None:
+            if blocking:
+                limiter.acquire_sync()
             else:
-                response = await client.get(
-                    path, headers=headers
-                )  # Added params to the request
-    except httpx.HTTPError as e:
-        print(e)
-        hd2api_logger.error(str(e), exc_info=e)
-        raise e
-
-    if response.status_code != 200:
-        raise HTTPException(
-            response.status_code, f"Failed with status code: {response.status_code}"
-        )
+                await limiter.acquire()
+        if record is not None:
+            record.start_attempt()
+        try:
+            # A sync client returns the response, an async one a coroutine.
+            sent = client.get(
+                path,
+                headers=headers,
+                params=params,
+                timeout=api_config.timeout,
+                extensions=extensions,
+            )
+            response = sent if blocking else await sent
+        except httpx.TransportError as e:
+            delay = api_config.retry.get_delay(attempt)
+            if delay is None:
+                hd2api_logger.error(str(e), exc_info=e)
+                raise e
+            log_retry(base_path, path, attempt, delay, e)
+            await sleep(delay)
+            continue
+        except httpx.HTTPError as e:
+            hd2api_logger.error(str(e), exc_info=e)
+            raise e
 
-    data = response.json()
-    return data
+        if record is not None:
+            record.finish(response)
+        if response.status_code in (200, 304):
+            session.bytes.record(endpoint, response)
+            return response
+        delay = get_status_delay(api_config, attempt, response)
+        if delay is None:
+            raise HTTPException(
+                response.status_code,
+                f"Failed with status code: {response.status_code}",
+            )
+        log_retry(base_path, path, attempt, delay, response.status_code)
+        await sleep(delay)
 
 
-def make_sync_api_request(
+def get_status_delay(
+    api_config: APIConfig, attempt: int, response: httpx.Response
+) -> Optional[float]:
+    """Get the seconds to wait before retrying a failed response, or None to give up."""
+    if response.status_code not in api_config.retry.retry_statuses:
+        return None
+    retry_after = parse_retry_after(response.headers.get("Retry-After", None))
+    return api_config.retry.get_delay(attempt, retry_after)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, given either in seconds or as an http date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(tz=timezone.utc)).total_seconds(), 0.0)
+
+
+def log_retry(base_path: str, path: str, attempt: int, delay: float, reason: Any) -> None:
+    hd2api_logger.warning(
+        "Attempt %s at %s%s failed (%s), retrying in %.2fs",
+        attempt,
+        base_path,
+        path,
+        reason,
+        delay,
+    )
+
+
+async def make_async_api_request(
     base_path: str, path: str, api_config: APIConfig, params: Optional[dict] = None
 ) -> Any:
-    """Make a synchronous request to any endpoint."""
+    """Make a asyncronous request to any endpoint."""
+    record = new_record(base_path, path, api_config.hooks)
+    try:
+        response = await make_async_api_response(
+            base_path, path, api_config, params, record=record
+        )
+        return decode_body(response, api_config, record)
+    except Exception as e:
+        if record is not None:
+            record.error = repr(e)
+        raise
+    finally:
+        if record is not None:
+            emit(api_config.hooks, record)
+
+
+async def make_async_model_request(
+    base_path: str,
+    path: str,
+    model: Type[T],
+    api_config: APIConfig,
+    params: Optional[dict] = None,
+    index: Optional[int] = None,
+) -> Optional[Union[T, List[T]]]:
+    """
+    Make a asyncronous request to any endpoint, and build the result into model.
+
+    If api_config.cache_enabled is set, built objects are kept in the session's
+    time-to-live cache, and identical requests made before the policy for the
+    model expires are answered without touching the network.
+
+    If api_config.coalesce is set, concurrent identical requests share a
+    single in-flight request, and all receive the same built object.  Requests
+    made in blocking mode aren't coalesced.
+
+    If api_config.revalidate is set, the ETag/Last-Modified validators of
+    each response are remembered and sent back with the next identical request.
+    When the server then answers 304 Not Modified, a shallow copy of the
+    previously built object, with a new retrieved_at, is returned without
+    downloading or validating the body again.
+
+    Args:
+        base_path (str): The base url of the upstream api.
+        path (str): The path of the endpoint.
+        model (Type[T]): The model class to build the response into.
+        api_config (APIConfig): The configuration to make the request with.
+        params (Optional[dict]): Query parameters for the request.
+        index (Optional[int]): An optional index for single-item responses.
+
+    Returns:
+        Optional[Union[T, List[T]]]: The built model instance(s).
+    """
+    session = api_config.get_session()
+    key = make_cache_key(
+        base_path,
+        resolve_path(path, api_config),
+        api_config.language,
+        params,
+        api_config.warID,
+        model.__name__,
+        index,
+    )
+    if api_config.cache_enabled:
+        cached = session.cache.get(key)
+        if cached is not None:
+            return cached
+
+    if api_config.coalesce and not is_blocking():
+        result, size = await session.coalesce(
+            key,
+            lambda: _fetch_model(base_path, path, model, api_config, params, index, key),
+        )
+    else:
+        result, size = await _fetch_model(
+            base_path, path, model, api_config, params, index, key
+        )
+
+    if api_config.cache_enabled and result is not None:
+        ttl = api_config.get_cache_ttl(model.__name__)
+        if ttl is None or ttl > 0:
+            session.cache.set(key, result, ttl, size)
+    return result
 
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "X-Super-Client": f"{api_config.get_client_name()}",
-        "Accept-Language": api_config.language,
-    }
 
+async def _fetch_model(
+    base_path: str,
+    path: str,
+    model: Type[T],
+    api_config: APIConfig,
+    params: Optional[dict],
+    index: Optional[int],
+    key: CacheKey,
+) -> Tuple[Optional[Union[T, List[T]]], int]:
+    """Request and build a model, revalidating it if possible, alongside its body size."""
+    record = new_record(base_path, path, api_config.hooks)
     try:
-        with httpx.Client(
-            base_url=base_path, verify=api_config.verify, timeout=api_config.timeout
-        ) as client:
-            if params:
-                response = client.get(path, headers=headers, params=params)
-            else:
-                response = client.get(path, headers=headers)
-    except httpx.HTTPError as e:
-        print(e)
-        hd2api_logger.error(str(e), exc_info=e)
-        raise e
-
-    if response.status_code != 200:
-        raise HTTPException(
-            response.status_code, f"Failed with status code: {response.status_code}"
+        if not api_config.revalidate:
+            response = await make_async_api_response(
+                base_path, path, api_config, params, record=record
+            )
+            result = build_output(response, model, api_config, index, record)
+            return result, len(response.content)
+
+        revalidation = api_config.get_session().revalidation
+        response = await make_async_api_response(
+            base_path,
+            path,
+            api_config,
+            params,
+            extra_headers=revalidation.conditional_headers(key),
+            record=record,
         )
+        if response.status_code == 304:
+            previous = revalidation.get(key)
+            if previous is not None:
+                result, size = previous
+                return refreshed_copy(result), size
+            # Nothing to fall back on, so ask again for the full body.
+            response = await make_async_api_response(
+                base_path, path, api_config, params, record=record
+            )
+
+        result = build_output(response, model, api_config, index, record)
+        revalidation.store(key, response, result)
+        return result, len(response.content)
+    except Exception as e:
+        if record is not None:
+            record.error = repr(e)
+        raise
+    finally:
+        if record is not None:
+            emit(api_config.hooks, record)
+
 
-    data = response.json()
+def decode_body(
+    response: httpx.Response,
+    api_config: APIConfig,
+    record: Optional[RequestRecord] = None,
+) -> Any:
+    """Decode the body of response with the configured json backend."""
+    if record is None:
+        return decode_json(response.content, api_config.json_backend)
+    start = time.perf_counter()
+    data = decode_json(response.content, api_config.json_backend)
+    record.decode_time = time.perf_counter() - start
     return data
+
+
+def build_output(
+    response: httpx.Response,
+    model: Type[T],
+    api_config: APIConfig,
+    index: Optional[int] = None,
+    record: Optional[RequestRecord] = None,
+) -> Union[T, List[T]]:
+    """Decode the body of response with the configured json backend and build model."""
+    if api_config.json_backend == "pydantic":
+        if record is None:
+            return make_output_from_json(response.content, model, index)
+        # Decoding and validation happen in one step, so only build_time is known.
+        start = time.perf_counter()
+        result = make_output_from_json(response.content, model, index)
+        record.build_time = time.perf_counter() - start
+        return result
+    data = decode_body(response, api_config, record)
+    if record is None:
+        return make_output(data, model, index)
+    start = time.perf_counter()
+    result = make_output(data, model, index)
+    record.build_time = time.perf_counter() - start
+    return result
+
+
+def make_sync_api_request(
+    base_path: str, path: str, api_config: APIConfig, params: Optional[dict] = None
+) -> Any:
+    """Make a synchronous request to any endpoint, see make_async_api_request."""
+    return run_blocking(make_async_api_request(base_path, path, api_config, params))
+
+
+def make_sync_model_request(
+    base_path: str,
+    path: str,
+    model: Type[T],
+    api_config: APIConfig,
+    params: Optional[dict] = None,
+    index: Optional[int] = None,
+) -> Optional[Union[T, List[T]]]:
+    """
+    Make a synchronous request to any endpoint, and build the result into
+    model, see make_async_model_request.
+    """
+    return run_blocking(
+        make_async_model_request(base_path, path, model, api_config, params, index)
+    )
@@ -0,0 +1,188 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+CacheKey = Tuple[Hashable, ...]
+# ETag, Last-Modified, the object built from the response, and the body size.
+RevalidationEntry = Tuple[Optional[str], Optional[str], Any, int]
+# Expiry time (or None for never), the cached object, and its size.
+CacheEntry = Tuple[Optional[float], Any, int]
+
+
+def make_cache_key(
+    base_path: str,
+    path: str,
+    language: str,
+    params: Optional[dict] = None,
+    *extra: Hashable,
+) -> CacheKey:
+    """
+    Build a hashable key identifying a single request.
+
+    Args:
+        base_path (str): The base url of the upstream api.
+        path (str): The requested path, with WARID already replaced.
+        language (str): The Accept-Language sent with the request.
+        params (Optional[dict]): Query parameters sent with the request.
+        *extra (Hashable): Anything else that changes the result, such as the model built.
+
+    Returns:
+        CacheKey: A tuple usable as a dictionary key.
+    """
+    param_key = tuple(sorted((params or {}).items()))
+    return (base_path, path, param_key, language) + extra
+
+
+class RevalidationCache:
+    """
+    Stores the ETag/Last-Modified validators of previous responses alongside
+    the object built from them, so that unchanged endpoints can be revalidated
+    with a conditional GET and answered from memory on a 304.
+
+    Entries are evicted least recently used first once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, RevalidationEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, key: CacheKey) -> Dict[str, str]:
+        """Get the If-None-Match/If-Modified-Since headers to send for key."""
+        with self._lock:
+            entry = self._entries.get(key, None)
+        if entry is None:
+            return {}
+        etag, last_modified, _, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def get(self, key: CacheKey) -> Optional[Tuple[Any, int]]:
+        """
+        Get the object previously built for key and the size of the body it
+        was built from, after the server answered 304.
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[2], entry[3]
+
+    def store(self, key: CacheKey, response: httpx.Response, result: Any) -> None:
+        """Remember result under key if the response carried any validators."""
+        etag = response.headers.get("ETag", None)
+        last_modified = response.headers.get("Last-Modified", None)
+        with self._lock:
+            if not etag and not last_modified:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (etag, last_modified, result, len(response.content))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheBackend(ABC):
+    """
+    Interface for the time-to-live cache of built response objects.
+
+    The default is the in-process MemoryTTLCache; a shared backend can be
+    plugged in by subclassing this and assigning an instance to
+    ``api_config.get_session().cache``.
+    """
+
+    @abstractmethod
+    def get(self, key: CacheKey) -> Any:
+        """Get the unexpired object stored under key, or None."""
+
+    @abstractmethod
+    def set(self, key: CacheKey, value: Any, ttl: Optional[float], size: int) -> None:
+        """Store value under key for ttl seconds, or forever if ttl is None."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+
+
+class MemoryTTLCache(CacheBackend):
+    """
+    In-process time-to-live cache with least recently used eviction.
+
+    Memory use is bounded by max_bytes, measured by the size of the response
+    bodies the cached objects were built from.
+
+    Attributes:
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that found nothing, or an expired entry.
+        evictions (int): Number of entries dropped to stay under the caps.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entries: int = 1024):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None:
+                expires, value, size = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.size_bytes -= size
+            self.misses += 1
+            return None
+
+    def set(self, key: CacheKey, value: Any, ttl: Optional[float], size: int) -> None:
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= old[2]
+            if size > self.max_bytes:
+                # Too big to keep, but whatever was stored under key is stale now.
+                return
+            self._entries[key] = (expires, value, size)
+            self.size_bytes += size
+            while self._entries and (
+                self.size_bytes > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit/miss counters and current size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+        }
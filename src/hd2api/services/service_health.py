@@ -0,0 +1,124 @@
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Union
+
+
+class SourceHealth:
+    """
+    Rolling health record of a single raw data source.
+
+    Latency is tracked per endpoint, as an exponentially weighted moving
+    average and a window of recent samples, since an endpoint such as All
+    makes several requests and takes far longer than the rest.  Failures are
+    tracked for the source as a whole, with a failure rate kept as a moving
+    average, and a circuit breaker that opens after too many consecutive
+    failures, skipping the source until its cooldown passes.
+    """
+
+    def __init__(self, name: str, alpha: float = 0.3, samples: int = 100):
+        self.name = name
+        self.alpha = alpha
+        self.samples = samples
+        self.latency: Dict[str, float] = {}
+        self.failure_rate = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.latencies: Dict[str, Deque[float]] = {}
+
+    def record_success(self, endpoint: str, latency: float) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        if endpoint not in self.latencies:
+            self.latencies[endpoint] = deque(maxlen=self.samples)
+        self.latencies[endpoint].append(latency)
+        if endpoint not in self.latency:
+            self.latency[endpoint] = latency
+        else:
+            self.latency[endpoint] += self.alpha * (latency - self.latency[endpoint])
+        self.failure_rate -= self.alpha * self.failure_rate
+
+    def record_failure(self, threshold: int, cooldown: float) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.failure_rate += self.alpha * (1.0 - self.failure_rate)
+        if self.consecutive_failures >= threshold:
+            self.open_until = time.monotonic() + cooldown
+
+    def is_open(self) -> bool:
+        """If the circuit breaker is currently skipping this source."""
+        return self.open_until > time.monotonic()
+
+    def score(self, endpoint: str) -> float:
+        """
+        Lower is healthier.  Sources without any successes on endpoint yet
+        score infinity.
+        """
+        latency = self.latency.get(endpoint, None)
+        if latency is None:
+            return float("inf")
+        return latency * (1.0 + 4.0 * self.failure_rate)
+
+    def sample_count(self, endpoint: str) -> int:
+        """Get how many recent successful latencies are kept for endpoint."""
+        return len(self.latencies.get(endpoint, ()))
+
+    def percentile(self, endpoint: str, pct: float) -> Optional[float]:
+        """Get a percentile of the recent successful latencies of endpoint, if any."""
+        samples = self.latencies.get(endpoint, None)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * pct / 100.0), len(ordered) - 1)]
+
+    def stats(self) -> Dict[str, Union[int, float, bool, Dict[str, float], None]]:
+        return {
+            "latency": dict(self.latency),
+            "failure_rate": self.failure_rate,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "open": self.is_open(),
+        }
+
+
+class SourceHealthTracker:
+    """Keeps the health of every raw data source, and ranks them for failover."""
+
+    def __init__(self) -> None:
+        self.sources: Dict[str, SourceHealth] = {}
+
+    def get(self, name: str) -> SourceHealth:
+        if name not in self.sources:
+            self.sources[name] = SourceHealth(name)
+        return self.sources[name]
+
+    def ranked(self, names: Sequence[str], endpoint: str) -> List[str]:
+        """
+        Order sources from healthiest to least healthy on endpoint, leaving out
+        those whose circuit breaker is open.
+
+        If every breaker is open, all sources are returned anyway, so a request
+        still probes them rather than failing without trying.  Ties, including
+        sources that haven't succeeded yet, keep the order of names.
+
+        Args:
+            names (Sequence[str]): The sources to rank, in order of preference.
+            endpoint (str): The endpoint whose latencies the sources are ranked by.
+
+        Returns:
+            List[str]: The sources to try, healthiest first.
+        """
+        order = {name: i for i, name in enumerate(names)}
+        closed = [name for name in names if not self.get(name).is_open()]
+        return sorted(
+            closed or names,
+            key=lambda name: (self.get(name).score(endpoint), order[name]),
+        )
+
+    def stats(
+        self,
+    ) -> Dict[str, Dict[str, Union[int, float, bool, Dict[str, float], None]]]:
+        return {name: health.stats() for name, health in self.sources.items()}
@@ -0,0 +1,248 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import httpx
+
+hd2api_logger = logging.getLogger("hd2api_logger")
+
+RequestHook = Callable[["RequestRecord"], None]
+
+# Timings reported by every record, in seconds.
+TIMINGS = (
+    "connect_time",
+    "tls_time",
+    "ttfb",
+    "total_time",
+    "decode_time",
+    "build_time",
+)
+
+
+class RequestRecord:
+    """
+    Structured record of a single request, handed to every hook in
+    ``APIConfig.hooks`` once the request finishes.
+
+    Network timings come from httpx's trace extension, and cover the last
+    attempt only.  connect_time includes DNS resolution, and is None when a
+    pooled connection was reused, as is tls_time for plain http.
+
+    Attributes:
+        endpoint (str): The base url and path template, before WARID is replaced.
+        host (str): The base url of the source the request was sent to.
+        status (Optional[int]): The status code of the final response.
+        attempts (int): How many attempts were made, including retries.
+        connect_time (Optional[float]): Seconds spent opening the connection.
+        tls_time (Optional[float]): Seconds spent on the TLS handshake.
+        ttfb (Optional[float]): Seconds until the response headers arrived.
+        total_time (Optional[float]): Seconds until the body was read.
+        response_bytes (Optional[int]): Bytes received over the wire.
+        decoded_bytes (Optional[int]): Bytes of the body after decompression.
+        decode_time (Optional[float]): Seconds spent decoding the json body.
+        build_time (Optional[float]): Seconds spent building models from it.
+        error (Optional[str]): The error the request failed with, if any.
+    """
+
+    def __init__(self, endpoint: str, host: str):
+        self.endpoint = endpoint
+        self.host = host
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.connect_time: Optional[float] = None
+        self.tls_time: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.total_time: Optional[float] = None
+        self.response_bytes: Optional[int] = None
+        self.decoded_bytes: Optional[int] = None
+        self.decode_time: Optional[float] = None
+        self.build_time: Optional[float] = None
+        self.error: Optional[str] = None
+        self._start = 0.0
+        self._started: Dict[str, float] = {}
+
+    def start_attempt(self) -> None:
+        self.attempts += 1
+        self.connect_time = self.tls_time = self.ttfb = None
+        self._started.clear()
+        self._start = time.perf_counter()
+
+    def trace(self, name: str, info: Dict[str, Any]) -> None:
+        """Callback for httpx's trace extension on sync clients."""
+        now = time.perf_counter()
+        step, _, event = name.rpartition(".")
+        if event == "started":
+            self._started[step] = now
+        elif event == "complete":
+            if step == "connection.connect_tcp":
+                self.connect_time = now - self._started.get(step, self._start)
+            elif step == "connection.start_tls":
+                self.tls_time = now - self._started.get(step, self._start)
+            elif step.endswith("receive_response_headers"):
+                self.ttfb = now - self._start
+
+    async def atrace(self, name: str, info: Dict[str, Any]) -> None:
+        """Callback for httpx's trace extension on async clients."""
+        self.trace(name, info)
+
+    def finish(self, response: httpx.Response) -> None:
+        """Record the outcome of the final attempt."""
+        self.total_time = time.perf_counter() - self._start
+        self.status = response.status_code
+        self.response_bytes = response.num_bytes_downloaded
+        self.decoded_bytes = len(response.content)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            key: value for key, value in vars(self).items() if not key.startswith("_")
+        }
+
+
+def new_record(
+    base_path: str, path: str, hooks: Sequence[RequestHook]
+) -> Optional[RequestRecord]:
+    """Get a record for a request, or None if no hook would receive it."""
+    if not hooks:
+        return None
+    return RequestRecord(f"{base_path}{path}", base_path)
+
+
+def emit(hooks: Sequence[RequestHook], record: RequestRecord) -> None:
+    """Hand record to every hook.  A failing hook never fails the request."""
+    for hook in hooks:
+        try:
+            hook(record)
+        except Exception as e:
+            hd2api_logger.error("Request hook %r failed: %s", hook, e, exc_info=e)
+
+
+class LoggingHook:
+    """Logs a single line for every request."""
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.INFO
+    ):
+        self.logger = logger or hd2api_logger
+        self.level = level
+
+    def __call__(self, record: RequestRecord) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+        parts = [
+            record.endpoint,
+            f"status={record.status}",
+            f"attempts={record.attempts}",
+            f"bytes={record.response_bytes}/{record.decoded_bytes}",
+        ]
+        parts.extend(
+            f"{name}={getattr(record, name) * 1000:.1f}ms"
+            for name in TIMINGS
+            if getattr(record, name) is not None
+        )
+        if record.error:
+            parts.append(f"error={record.error}")
+        self.logger.log(self.level, " ".join(parts))
+
+
+class Histogram:
+    """Fixed bucket histogram of non negative values."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Estimate a percentile, as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return None
+        target = self.count * pct / 100.0
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def stats(self) -> Dict[str, Union[int, float, None]]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+def default_time_bounds() -> List[float]:
+    """Exponential bucket bounds from 1ms to about 65 seconds."""
+    return [0.001 * 2**i for i in range(17)]
+
+
+class HistogramHook:
+    """
+    Aggregates the timings and sizes of every request into in-memory
+    histograms, per endpoint.
+
+    Example:
+        histograms = HistogramHook()
+        config = APIConfig(hooks=[histograms])
+        ...
+        print(histograms.stats()[endpoint]["ttfb"]["p90"])
+    """
+
+    def __init__(self, bounds: Optional[Sequence[float]] = None):
+        self.bounds = list(bounds) if bounds is not None else default_time_bounds()
+        self.size_bounds = [1024.0 * 2**i for i in range(16)]
+        self.endpoints: Dict[str, Dict[str, Histogram]] = {}
+        self.statuses: Dict[str, Dict[Optional[int], int]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record: RequestRecord) -> None:
+        with self._lock:
+            histograms = self.endpoints.get(record.endpoint, None)
+            if histograms is None:
+                histograms = self.endpoints[record.endpoint] = {}
+            for name in TIMINGS:
+                value = getattr(record, name)
+                if value is not None:
+                    self._get(histograms, name, self.bounds).add(value)
+            for name in ("response_bytes", "decoded_bytes"):
+                value = getattr(record, name)
+                if value is not None:
+                    self._get(histograms, name, self.size_bounds).add(value)
+            statuses = self.statuses.setdefault(record.endpoint, {})
+            statuses[record.status] = statuses.get(record.status, 0) + 1
+
+    @staticmethod
+    def _get(
+        histograms: Dict[str, Histogram], name: str, bounds: List[float]
+    ) -> Histogram:
+        if name not in histograms:
+            histograms[name] = Histogram(bounds)
+        return histograms[name]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the summary of every histogram and the status code counts, per endpoint."""
+        with self._lock:
+            return {
+                endpoint: {
+                    **{name: h.stats() for name, h in histograms.items()},
+                    "statuses": dict(self.statuses.get(endpoint, {})),
+                }
+                for endpoint, histograms in self.endpoints.items()
+            }
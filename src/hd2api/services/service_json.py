@@ -0,0 +1,61 @@
+import json
+from typing import Any, Callable, Dict, Literal, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+JsonBackend = Literal["auto", "orjson", "msgspec", "json", "pydantic"]
+
+JsonLoads = Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib_loads(content: Union[bytes, str]) -> Any:
+    return json.loads(content)
+
+
+def available_backends() -> Dict[str, JsonLoads]:
+    """Get the loads function of every json decoder that is installed, fastest first."""
+    backends: Dict[str, JsonLoads] = {}
+    if orjson is not None:
+        backends["orjson"] = orjson.loads
+    if msgspec is not None:
+        backends["msgspec"] = msgspec.json.decode
+    backends["json"] = _stdlib_loads
+    return backends
+
+
+_backends = available_backends()
+
+
+def get_json_loads(backend: str = "auto") -> JsonLoads:
+    """
+    Get the function used to decode response bodies.
+
+    Args:
+        backend (str): 'orjson', 'msgspec' or 'json'.  'auto' and 'pydantic' use
+            the fastest one installed, preferring orjson, then msgspec, then the
+            standard library.
+
+    Returns:
+        JsonLoads: A function decoding bytes or str into python objects.
+
+    Raises:
+        ValueError: If the requested backend isn't installed.
+    """
+    if backend in ("auto", "pydantic"):
+        return next(iter(_backends.values()))
+    if backend not in _backends:
+        raise ValueError(f"JSON backend '{backend}' is not installed.")
+    return _backends[backend]
+
+
+def decode_json(content: Union[bytes, str], backend: str = "auto") -> Any:
+    """Decode a json response body with the given backend."""
+    return get_json_loads(backend)(content)
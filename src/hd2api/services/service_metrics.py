@@ -0,0 +1,69 @@
+import importlib.util
+import threading
+from collections import Counter
+from typing import Dict, List, Union
+
+import httpx
+
+
+def accepted_encodings() -> List[str]:
+    """Get the content encodings httpx can decode with the packages installed."""
+    encodings = ["gzip", "deflate"]
+    if any(importlib.util.find_spec(name) for name in ("brotli", "brotlicffi")):
+        encodings.append("br")
+    if importlib.util.find_spec("zstandard") is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+ACCEPT_ENCODING = ", ".join(accepted_encodings())
+
+
+class EndpointBytes:
+    """Transfer totals of a single endpoint."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.compressed_bytes = 0
+        self.decompressed_bytes = 0
+        self.encodings: Counter = Counter()
+
+    def stats(self) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        return {
+            "requests": self.requests,
+            "compressed_bytes": self.compressed_bytes,
+            "decompressed_bytes": self.decompressed_bytes,
+            "ratio": self.compressed_bytes / max(self.decompressed_bytes, 1),
+            "encodings": dict(self.encodings),
+        }
+
+
+class ByteAccounting:
+    """
+    Tracks the bytes sent over the wire against the bytes after decompression,
+    per endpoint, to show how much bandwidth each endpoint uses and whether
+    compression is actually in effect.
+
+    Endpoints are keyed by base url and path as given to the request, before
+    WARID is replaced, so every war season adds to the same totals.
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointBytes] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, response: httpx.Response) -> None:
+        """Add a fully read response to the totals of endpoint."""
+        encoding = response.headers.get("Content-Encoding", "identity")
+        with self._lock:
+            totals = self.endpoints.get(endpoint, None)
+            if totals is None:
+                totals = self.endpoints[endpoint] = EndpointBytes()
+            totals.requests += 1
+            totals.compressed_bytes += response.num_bytes_downloaded
+            totals.decompressed_bytes += len(response.content)
+            totals.encodings[encoding] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Union[int, float, Dict[str, int]]]]:
+        with self._lock:
+            return {name: totals.stats() for name, totals in self.endpoints.items()}
@@ -0,0 +1,152 @@
+import threading
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..models import NewsFeedItem
+
+if TYPE_CHECKING:
+    from ..api_config import APIConfig
+
+# How far back in war time the news feed is requested when nothing was seen yet.
+NEWS_WINDOW = 10000000
+
+
+class NewsFeedCursor:
+    """
+    Remembers the news feed of one source across polls, so each poll only
+    asks for items published since the newest one already seen.
+
+    New items are merged into a bounded feed, deduplicated by id.  An item
+    seen again replaces the stored copy, so edited dispatches are picked up.
+    Items older than the window are dropped, so the merged feed holds the
+    same items a full request for the window would return.
+
+    Args:
+        max_items (int): The most items kept, dropping the oldest first.
+        window (int): How far back in war time items are kept for.
+    """
+
+    def __init__(self, max_items: int = 1024, window: int = NEWS_WINDOW):
+        self.max_items = max_items
+        self.window = window
+        self.war_id: Optional[int] = None
+        self.latest_published: Optional[int] = None
+        self.latest_id: Optional[int] = None
+        self._items: Dict[int, NewsFeedItem] = {}
+        self._lock = threading.Lock()
+
+    def from_timestamp(self, war_time: int) -> int:
+        """
+        Get the fromTimestamp for the next request.
+
+        The newest seen timestamp is requested again, as more items may have
+        been published at that same time; they are deduplicated on merge.
+        """
+        start = war_time - self.window
+        with self._lock:
+            if self.latest_published is None:
+                return start
+            return max(start, self.latest_published)
+
+    def merge(self, items: List[NewsFeedItem], war_time: int) -> List[NewsFeedItem]:
+        """
+        Merge newly fetched items into the feed.
+
+        Args:
+            items (List[NewsFeedItem]): Items returned by the latest request.
+            war_time (int): The current war time, to expire old items with.
+
+        Returns:
+            List[NewsFeedItem]: The whole feed, oldest first.
+        """
+        with self._lock:
+            for item in items:
+                if item.id is None:
+                    continue
+                self._items[item.id] = item
+                if item.published is not None and (
+                    self.latest_published is None
+                    or (item.published, item.id)
+                    > (self.latest_published, self.latest_id)
+                ):
+                    self.latest_published, self.latest_id = item.published, item.id
+            start = war_time - self.window
+            feed = sorted(
+                (
+                    item
+                    for item in self._items.values()
+                    if item.published is None or item.published >= start
+                ),
+                key=self._order,
+            )[-self.max_items :]
+            self._items = {item.id: item for item in feed}
+            return feed
+
+    @staticmethod
+    def _order(item: NewsFeedItem) -> Tuple[int, int]:
+        return (item.published or 0, item.id or 0)
+
+    def reset(self, war_id: Optional[int] = None) -> None:
+        """Forget every item, as when a new war begins."""
+        with self._lock:
+            self.war_id = war_id
+            self.latest_published = self.latest_id = None
+            self._items = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def get_news_cursor(
+    api_config: "APIConfig", source: str
+) -> Optional[NewsFeedCursor]:
+    """
+    Get the news feed cursor of a source, kept in the config's session.
+
+    The cursor is reset whenever api_config.warID changes.
+
+    Args:
+        api_config (APIConfig): The config whose session holds the cursor.
+        source (str): The source the news feed is requested from.
+
+    Returns:
+        Optional[NewsFeedCursor]: The cursor, or None if api_config.news_cursor is off.
+    """
+    if not api_config.news_cursor:
+        return None
+    cursors = api_config.get_session().news_cursors
+    cursor = cursors.get(source, None)
+    if cursor is None:
+        cursor = cursors.setdefault(source, NewsFeedCursor())
+    if cursor.war_id != api_config.warID:
+        cursor.reset(api_config.warID)
+    return cursor
+
+
+async def fetch_news(
+    api_config: "APIConfig",
+    source: str,
+    getter: Callable[..., Awaitable[List[NewsFeedItem]]],
+    war_time: int,
+) -> List[NewsFeedItem]:
+    """
+    Fetch the news feed of a source for one of the *All getters.
+
+    With api_config.news_cursor on, only items published since the last poll
+    are requested, and merged into the source's cursor.  Otherwise the whole
+    window is requested.
+
+    Args:
+        api_config (APIConfig): The config to request the feed with.
+        source (str): The source the news feed is requested from.
+        getter (Callable[..., Awaitable[List[NewsFeedItem]]]): The source's
+            news feed getter, taking api_config and fromTimestamp.
+        war_time (int): The current war time, from the war status.
+
+    Returns:
+        List[NewsFeedItem]: The news feed, oldest first if merged.
+    """
+    cursor = get_news_cursor(api_config, source)
+    if cursor is None:
+        return await getter(api_config, fromTimestamp=war_time - NEWS_WINDOW)
+    items = await getter(api_config, fromTimestamp=cursor.from_timestamp(war_time))
+    return cursor.merge(items, war_time)
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Union
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the rate of requests made to a single upstream host.
+
+    Tokens refill at ``rate`` per second, up to ``burst`` tokens.  Every request
+    reserves one token, waiting until it becomes available if the bucket is
+    empty; reservations are handed out in order, so waiters are served fairly.
+
+    The same bucket can be used from both async and sync code.
+
+    Attributes:
+        waiting (int): Number of requests currently waiting for a token.
+        acquired (int): Total number of tokens handed out.
+        throttled (int): Number of requests that had to wait at all.
+        total_wait (float): Total seconds spent waiting for tokens.
+        max_wait (float): Longest single wait for a token, in seconds.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens: float = float(self.burst)
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve a token, returning how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            self.acquired += 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                self.waiting += 1
+            return wait
+
+    def _release(self) -> None:
+        with self._lock:
+            self.waiting -= 1
+
+    async def acquire(self) -> float:
+        """Wait for a token.  Returns the seconds waited."""
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release()
+        return wait
+
+    def acquire_sync(self) -> float:
+        """Block until a token is available.  Returns the seconds waited."""
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release()
+        return wait
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Get the queue depth and wait time metrics of this bucket."""
+        with self._lock:
+            return {
+                "waiting": self.waiting,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+                "average_wait": self.total_wait / max(self.throttled, 1),
+            }
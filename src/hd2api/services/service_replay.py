@@ -0,0 +1,239 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+import httpx
+
+hd2api_logger = logging.getLogger("hd2api_logger")
+
+# Headers that describe the recorded body as it was sent over the wire,
+# which no longer apply once it's stored decompressed.
+_WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+ReplayLatency = Union[float, str, None]
+
+
+def fixture_name(request: httpx.Request) -> Tuple[str, str]:
+    """
+    Get the fixture a request is recorded to and replayed from.
+
+    Fixtures are grouped in one folder per host, ignoring the port.  The
+    file name is the request path and query with every unsafe character
+    replaced, suffixed by the Accept-Language header, since the game's api
+    localizes its text.
+
+    Returns:
+        Tuple[str, str]: The host folder, and the file name without extension.
+    """
+    url = request.url
+    name = url.path.strip("/") or "index"
+    if url.query:
+        name += "__" + url.query.decode("ascii")
+    language = request.headers.get("Accept-Language", None)
+    if language:
+        name += "." + language
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    return url.host, name
+
+
+class FixtureStore:
+    """
+    A directory of recorded responses.
+
+    Each response is kept in two files: ``<name>.body`` holding the exact,
+    decompressed response body, and ``<name>.json`` holding the status code,
+    headers, url and the seconds the live request took.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def paths(self, request: httpx.Request) -> Tuple[str, str]:
+        host, name = fixture_name(request)
+        folder = os.path.join(self.directory, host)
+        return (
+            os.path.join(folder, name + ".json"),
+            os.path.join(folder, name + ".body"),
+        )
+
+    def save(self, request: httpx.Request, response: httpx.Response, elapsed: float):
+        """Store a response that has been read."""
+        meta_path, body_path = self.paths(request)
+        meta = {
+            "method": request.method,
+            "url": str(request.url),
+            "status_code": response.status_code,
+            "headers": {
+                key: value
+                for key, value in response.headers.items()
+                if key.lower() not in _WIRE_HEADERS
+            },
+            "elapsed": elapsed,
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            for path, data in (
+                (body_path, response.content),
+                (meta_path, json.dumps(meta, indent=2).encode()),
+            ):
+                # Written aside and moved into place, so a reader never sees
+                # half a fixture.
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+
+    def load(
+        self, request: httpx.Request
+    ) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Get the metadata and body recorded for a request, or None if there isn't one."""
+        meta_path, body_path = self.paths(request)
+        try:
+            with open(meta_path, "rb") as f:
+                meta = json.loads(f.read())
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        return meta, body
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Transport that sends every request through a live transport and records
+    each response to a FixtureStore.
+
+    304 responses aren't recorded, so revalidating a recorded endpoint
+    never replaces its body with an empty one.  Fixtures hold the decompressed
+    body, while the response handed back keeps its original headers and
+    encoded body, so byte accounting works the same as without recording.
+
+    Args:
+        directory (str): The fixture directory to record to.
+        transport (Union[httpx.BaseTransport, httpx.AsyncBaseTransport]): The
+            transport actually sending requests.  Must be an async transport
+            when used by an AsyncClient.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        transport: Union[httpx.BaseTransport, httpx.AsyncBaseTransport],
+    ):
+        self.store = FixtureStore(directory)
+        self.transport = transport
+
+    def _recorded(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        raw: bytes,
+        elapsed: float,
+    ) -> httpx.Response:
+        if response.status_code != 304:
+            decoded = httpx.Response(
+                response.status_code,
+                headers=response.headers,
+                stream=httpx.ByteStream(raw),
+            )
+            decoded.read()
+            self.store.save(request, decoded, elapsed)
+        # Handed back as it came over the wire, still compressed, so the
+        # client decodes it and counts the bytes downloaded as usual.
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(raw),
+            extensions=response.extensions,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self.transport.handle_request(request)
+        try:
+            # Iterating the stream itself gives the body as sent, still encoded.
+            raw = b"".join(response.stream)  # type: ignore[union-attr]
+        finally:
+            response.close()
+        return self._recorded(request, response, raw, time.perf_counter() - start)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        try:
+            raw = b"".join([chunk async for chunk in response.stream])  # type: ignore
+        finally:
+            await response.aclose()
+        return self._recorded(request, response, raw, time.perf_counter() - start)
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Transport that answers every request from a FixtureStore, without
+    touching the network.
+
+    Conditional requests are answered with a 304 when they match the
+    recorded ETag or Last-Modified, as the live server would.  Requests
+    without a fixture get a 404, and a warning is logged.
+
+    Args:
+        directory (str): The fixture directory to replay from.
+        latency (ReplayLatency): Simulated latency of each response.  None
+            answers immediately, a number waits that many seconds, and
+            'recorded' waits as long as the live request took.
+    """
+
+    def __init__(self, directory: str, latency: ReplayLatency = None):
+        self.store = FixtureStore(directory)
+        self.latency = latency
+
+    def _delay(self, meta: Optional[Dict[str, Any]]) -> float:
+        if self.latency is None:
+            return 0.0
+        if self.latency == "recorded":
+            return meta.get("elapsed", 0.0) if meta is not None else 0.0
+        return float(self.latency)
+
+    def _respond(
+        self, request: httpx.Request
+    ) -> Tuple[Optional[Dict[str, Any]], httpx.Response]:
+        fixture = self.store.load(request)
+        if fixture is None:
+            hd2api_logger.warning("No recorded fixture for %s", request.url)
+            return None, httpx.Response(
+                404, json={"error": f"No recorded fixture for {request.url}"}
+            )
+        meta, body = fixture
+        headers = meta.get("headers", {})
+        etag = headers.get("etag", headers.get("ETag", None))
+        modified = headers.get("last-modified", headers.get("Last-Modified", None))
+        if (etag and request.headers.get("If-None-Match", None) == etag) or (
+            modified and request.headers.get("If-Modified-Since", None) == modified
+        ):
+            return meta, httpx.Response(304, headers=headers)
+        return meta, httpx.Response(meta["status_code"], headers=headers, content=body)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        meta, response = self._respond(request)
+        delay = self._delay(meta)
+        if delay > 0:
+            time.sleep(delay)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        meta, response = self._respond(request)
+        delay = self._delay(meta)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
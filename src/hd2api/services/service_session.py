@@ -0,0 +1,365 @@
+import asyncio
+import importlib.util
+import logging
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from .service_cache import CacheBackend, CacheKey, MemoryTTLCache, RevalidationCache
+from .service_health import SourceHealthTracker
+from .service_metrics import ByteAccounting
+from .service_news import NewsFeedCursor
+from .service_ratelimit import TokenBucket
+from .service_replay import RecordingTransport, ReplayTransport
+
+if TYPE_CHECKING:
+    from ..api_config import APIConfig, RateLimit
+
+hd2api_logger = logging.getLogger("hd2api_logger")
+
+
+# An async client, the event loop it is bound to, and its closing guard.
+AsyncClientEntry = Tuple[
+    asyncio.AbstractEventLoop, httpx.AsyncClient, AsyncGenerator[None, None]
+]
+
+
+def http2_available() -> bool:
+    """If the optional h2 package httpx needs for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+async def _close_with_loop(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """
+    Guard that closes client when finalized.
+
+    Once started, the running event loop finalizes it when shutting down, as
+    asyncio.run does, so client is closed before its loop is, even if nobody
+    closes the session.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _start_guard(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    guard = _close_with_loop(client)
+    try:
+        # Runs up to the yield, which registers the guard with the running loop.
+        guard.asend(None).send(None)
+    except StopIteration:
+        pass
+    return guard
+
+
+class APISession:
+    """
+    Runtime state shared by every request made with a single APIConfig.
+
+    Keeps one pooled ``httpx.AsyncClient`` and one pooled ``httpx.Client``
+    per base url alive across calls, so repeated polling of the same host
+    reuses open connections instead of paying for a new TCP and TLS handshake
+    on every request.
+    Also holds the validators used to revalidate unchanged responses,
+    the time-to-live cache of built objects, the requests currently in flight,
+    the rate limiter of each host, the health of each raw data source,
+    the bytes transferred by each endpoint, and the news feed seen so far
+    from each source.
+
+    With ``APIConfig.transport`` set to 'record' or 'replay', the clients
+    record every response to, or answer every request from, the fixture
+    directory instead.
+
+    The session can be closed explicitly with ``aclose`` or ``close``, or used
+    as an async or regular context manager.  Async clients are also closed
+    when the event loop they are bound to shuts down.
+    """
+
+    def __init__(self, api_config: "APIConfig"):
+        self.settings = self.settings_of(api_config)
+        self.limits = httpx.Limits(
+            max_connections=api_config.max_connections,
+            max_keepalive_connections=api_config.max_keepalive_connections,
+            keepalive_expiry=api_config.keepalive_expiry,
+        )
+        self.verify = api_config.verify
+        self.timeout = api_config.timeout
+        self.http2 = api_config.http2 and http2_available()
+        if api_config.http2 and not self.http2:
+            hd2api_logger.warning(
+                "HTTP/2 was requested, but h2 isn't installed; using HTTP/1.1."
+            )
+        self.transport_mode = api_config.transport
+        self.fixture_dir = api_config.fixture_dir
+        self.replay_latency = api_config.replay_latency
+        self._async_clients: Dict[str, AsyncClientEntry] = {}
+        self._retired_clients: List[AsyncClientEntry] = []
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self._sync_lock = threading.Lock()
+        self.revalidation = RevalidationCache()
+        self.cache: CacheBackend = MemoryTTLCache(max_bytes=api_config.cache_max_bytes)
+        self.inflight: Dict[CacheKey, "asyncio.Task[Any]"] = {}
+        self.coalesced = 0
+        self._waiters: Dict["asyncio.Task[Any]", int] = {}
+        # Each bucket is kept with a copy of the RateLimit it was built from.
+        self.rate_limiters: Dict[str, Tuple[Optional["RateLimit"], Optional[TokenBucket]]] = {}
+        self.health = SourceHealthTracker()
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.bytes = ByteAccounting()
+        self.news_cursors: Dict[str, NewsFeedCursor] = {}
+
+    @staticmethod
+    def settings_of(api_config: "APIConfig") -> Tuple[Any, ...]:
+        """The settings of api_config a session is built with."""
+        return (
+            api_config.max_connections,
+            api_config.max_keepalive_connections,
+            api_config.keepalive_expiry,
+            api_config.verify,
+            api_config.timeout,
+            api_config.http2,
+            api_config.transport,
+            api_config.fixture_dir,
+            api_config.replay_latency,
+            api_config.cache_max_bytes,
+        )
+
+    def get_async_client(self, base_path: str) -> httpx.AsyncClient:
+        """
+        Get the pooled async client for base_path, creating it if needed.
+
+        Clients are bound to the event loop they were first used in.  If the
+        running loop changed since then (for example, after a second call to
+        asyncio.run), a fresh client is created for the new loop.  The old
+        client was closed when its loop shut down, or is closed along with
+        the session.
+
+        Args:
+            base_path (str): The base url of the upstream api.
+
+        Returns:
+            httpx.AsyncClient: A client with a connection pool for base_path.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(base_path, None)
+        if entry is not None:
+            client_loop, client, _ = entry
+            if client_loop is loop and not client.is_closed:
+                return client
+            hd2api_logger.info("Replacing pooled client for %s", base_path)
+            self._retire(entry)
+        client = httpx.AsyncClient(
+            base_url=base_path,
+            verify=self.verify,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            transport=self._make_transport(httpx.AsyncHTTPTransport),
+        )
+        self._async_clients[base_path] = (loop, client, _start_guard(client))
+        return client
+
+    def _retire(self, entry: AsyncClientEntry) -> None:
+        """Close an async client that is no longer used, or keep it to close later."""
+        if not self._close_elsewhere(entry):
+            self._retired_clients.append(entry)
+
+    @staticmethod
+    def _close_elsewhere(entry: AsyncClientEntry) -> bool:
+        """
+        Close an async client from outside its event loop, if possible.
+
+        Returns:
+            bool: False if the client is still open, and must be closed later.
+        """
+        loop, client, guard = entry
+        if client.is_closed or loop.is_closed():
+            # A closed loop finalized the guard on shutdown, or can't run it anymore.
+            return True
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(guard.aclose(), loop)
+            return True
+        try:
+            loop.run_until_complete(guard.aclose())
+        except RuntimeError:
+            # Another event loop is running in this thread.
+            return False
+        return True
+
+    def get_sync_client(self, base_path: str) -> httpx.Client:
+        """
+        Get the pooled sync client for base_path, creating it if needed.
+
+        The client is shared between threads, so worker threads all draw from
+        the same connection pool.
+
+        Args:
+            base_path (str): The base url of the upstream api.
+
+        Returns:
+            httpx.Client: A client with a connection pool for base_path.
+        """
+        client = self._sync_clients.get(base_path, None)
+        if client is not None and not client.is_closed:
+            return client
+        with self._sync_lock:
+            client = self._sync_clients.get(base_path, None)
+            if client is None or client.is_closed:
+                client = httpx.Client(
+                    base_url=base_path,
+                    verify=self.verify,
+                    timeout=self.timeout,
+                    limits=self.limits,
+                    http2=self.http2,
+                    transport=self._make_transport(httpx.HTTPTransport),
+                )
+                self._sync_clients[base_path] = client
+        return client
+
+    def _make_transport(self, transport_class: Any) -> Any:
+        """
+        Get the transport clients should use, or None for httpx's default.
+
+        Args:
+            transport_class (Any): httpx.HTTPTransport or httpx.AsyncHTTPTransport,
+                used for the live requests of the recording transport.
+        """
+        if self.transport_mode == "replay":
+            return ReplayTransport(self.fixture_dir, self.replay_latency)
+        if self.transport_mode == "record":
+            live = transport_class(
+                verify=self.verify, limits=self.limits, http2=self.http2
+            )
+            return RecordingTransport(self.fixture_dir, live)
+        return None
+
+    def get_rate_limiter(
+        self, base_path: str, api_config: "APIConfig"
+    ) -> Optional[TokenBucket]:
+        """
+        Get the token bucket shared by every request sent to base_path.
+
+        If the rate limit of base_path was changed since the bucket was
+        built, it's replaced by a bucket for the new limit.
+
+        Args:
+            base_path (str): The base url of the upstream api.
+            api_config (APIConfig): The config holding the rate limit settings.
+
+        Returns:
+            Optional[TokenBucket]: The bucket, or None if base_path isn't rate limited.
+        """
+        limit = api_config.get_rate_limit(base_path)
+        built = self.rate_limiters.get(base_path)
+        if built is None or built[0] != limit:
+            bucket = TokenBucket(limit.rate, limit.burst) if limit is not None else None
+            built = (limit.model_copy() if limit is not None else None, bucket)
+            self.rate_limiters[base_path] = built
+        return built[1]
+
+    async def coalesce(
+        self, key: CacheKey, request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Await request(), unless an identical request is already in flight,
+        in which case its result is awaited instead.
+
+        Args:
+            key (CacheKey): The key identifying the request.
+            request (Callable[[], Awaitable[Any]]): Makes the request if none is in flight.
+
+        Returns:
+            Any: The result of the shared request.
+        """
+        loop = asyncio.get_running_loop()
+        task = self.inflight.get(key, None)
+        if task is not None and task.get_loop() is loop:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(request())
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shielded, so one caller being cancelled doesn't cancel the rest.
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Nobody is left waiting on the request, so stop it.
+                    task.cancel()
+                    if self.inflight.get(key, None) is task:
+                        del self.inflight[key]
+
+    def _finish_inflight(self, key: CacheKey, task: "asyncio.Task[Any]") -> None:
+        if self.inflight.get(key, None) is task:
+            del self.inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away.
+            task.exception()
+
+    def _close_sync_clients(self) -> None:
+        with self._sync_lock:
+            sync_clients = list(self._sync_clients.values())
+            self._sync_clients.clear()
+        for client in sync_clients:
+            client.close()
+
+    def _take_async_clients(self) -> List[AsyncClientEntry]:
+        entries = list(self._async_clients.values()) + self._retired_clients
+        self._async_clients.clear()
+        self._retired_clients = []
+        return entries
+
+    def close(self) -> None:
+        """
+        Close every pooled client owned by this session, from synchronous code.
+
+        Async clients are closed in their own event loop: scheduled on it if
+        it is running, or run to completion on it if it is stopped.
+        """
+        self._close_sync_clients()
+        for entry in self._take_async_clients():
+            if not self._close_elsewhere(entry):
+                hd2api_logger.warning(
+                    "Couldn't close a pooled client from inside another event loop."
+                )
+
+    async def aclose(self) -> None:
+        """Close every pooled client owned by this session."""
+        self._close_sync_clients()
+        loop = asyncio.get_running_loop()
+        for entry in self._take_async_clients():
+            if entry[0] is loop:
+                await entry[2].aclose()
+            elif not self._close_elsewhere(entry):
+                hd2api_logger.warning(
+                    "Couldn't close a pooled client of a stopped event loop."
+                )
+
+    async def __aenter__(self) -> "APISession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def __enter__(self) -> "APISession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, List, Tuple, TypeVar
+
+from .service_utils import SkippedPart, gather_futures
+
+R = TypeVar("R")
+
+_blocking: ContextVar[bool] = ContextVar("hd2api_blocking", default=False)
+
+
+def is_blocking() -> bool:
+    """If the current call is running in blocking mode, see run_blocking."""
+    return _blocking.get()
+
+
+def run_blocking(coro: Coroutine[Any, Any, R]) -> R:
+    """
+    Run one of this library's coroutines to completion without an event loop.
+
+    Every getter is written once, as a coroutine.  In blocking mode the
+    service layer sends requests through the session's pooled sync client
+    and waits with time.sleep, so the coroutine finishes without ever
+    suspending, and can be driven straight to its result.
+
+    Args:
+        coro (Coroutine[Any, Any, R]): The coroutine to run.
+
+    Returns:
+        R: What the coroutine returned.
+
+    Raises:
+        RuntimeError: If the coroutine awaited something asynchronous anyway.
+    """
+    token = _blocking.set(True)
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    finally:
+        _blocking.reset(token)
+    coro.close()
+    raise RuntimeError(f"{coro!r} suspended while running in blocking mode.")
+
+
+def synchronous(func: Callable[..., Coroutine[Any, Any, R]]) -> Callable[..., R]:
+    """Get a blocking version of an async getter, under the same name."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> R:
+        return run_blocking(func(*args, **kwargs))
+
+    return wrapper
+
+
+async def sleep(seconds: float) -> None:
+    """asyncio.sleep, or time.sleep in blocking mode."""
+    if is_blocking():
+        time.sleep(seconds)
+    else:
+        await asyncio.sleep(seconds)
+
+
+async def gather_parts(*coros: Coroutine[Any, Any, Any]) -> List[Any]:
+    """
+    Run coroutines concurrently, returning each result or the exception it
+    raised, in the same manner as asyncio.gather(..., return_exceptions=True).
+
+    In blocking mode, each coroutine runs in a worker thread instead.
+    """
+    if not is_blocking():
+        return await asyncio.gather(*coros, return_exceptions=True)
+    with ThreadPoolExecutor(max_workers=len(coros)) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, run_blocking, coro)
+            for coro in coros
+        ]
+        return gather_futures(futures)
+
+
+async def chain_parts(
+    first: Coroutine[Any, Any, R],
+    then: Callable[[R], Coroutine[Any, Any, Any]],
+    name: str,
+) -> Tuple[Any, Any]:
+    """
+    Run first, then pass its result to then, for a part that depends on another.
+
+    Args:
+        first (Coroutine[Any, Any, R]): The part depended on.
+        then (Callable[[R], Coroutine[Any, Any, Any]]): Gets the dependent part.
+        name (str): The name of the first part, for when then is skipped.
+
+    Returns:
+        Tuple[Any, Any]: The result of each, or the exception it raised.  If
+            first failed, then isn't called and is a SkippedPart instead.
+    """
+    try:
+        result = await first
+    except Exception as e:
+        return e, SkippedPart(f"{name} failed")
+    try:
+        return result, await then(result)
+    except Exception as e:
+        return result, e
@@ -1,10 +1,23 @@
-import datetime
-from typing import Any, List, Optional, Type, TypeVar, Union
+import logging
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar, Union
 
-from ..models.ABC.model import BaseApiModel
+from pydantic import TypeAdapter
+
+from ..models.ABC.model import BaseApiModel, retrieved_at_context
+from .service_json import decode_json
 
 T = TypeVar("T", bound=BaseApiModel)
 
+hd2api_logger = logging.getLogger("hd2api_logger")
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(model: Type[T]) -> TypeAdapter:
+    """Get the cached TypeAdapter validating a whole list of model in one call."""
+    return TypeAdapter(List[model])
+
 
 def make_output(
     data: Any, model: Type[T], index: Optional[int] = None
@@ -12,6 +25,9 @@ def make_output(
     """
     Process the API response data based on the model type and index.
 
+    Lists are validated in a single call through a cached TypeAdapter.  Every
+    model built, nested ones included, shares one retrieved_at time.
+
     Args:
         data (Any): The raw API response data.
         model (Type[T]): The model class to instantiate.
@@ -21,18 +37,129 @@ def make_output(
         Union[Any, List[Any]]: The processed model instance(s).
     """
 
-    now = datetime.datetime.now(tz=datetime.timezone.utc)
-    if index is not None:
-        if isinstance(data, dict) and data or isinstance(data, list) and data:
-            mod = model(**(data if isinstance(data, dict) else data[0]))
-            mod.retrieved_at = now
-            return mod
-        return model()
-    else:
-        if isinstance(data, list):
-            return [model(**item, retrieved_at=now) for item in data] if data else []
-        elif isinstance(data, dict) and data:
-            mod = model(**data)
-            mod.retrieved_at = now
-            return mod
+    with retrieved_at_context() as now:
+        if index is not None:
+            if isinstance(data, dict) and data or isinstance(data, list) and data:
+                mod = model(**(data if isinstance(data, dict) else data[0]))
+                mod.retrieved_at = now
+                return mod
+            return model()
+        else:
+            if isinstance(data, list):
+                return get_list_adapter(model).validate_python(data) if data else []
+            elif isinstance(data, dict) and data:
+                mod = model(**data)
+                mod.retrieved_at = now
+                return mod
+            return None
+
+
+def make_output_from_json(
+    content: Union[bytes, str], model: Type[T], index: Optional[int] = None
+) -> Union[T, List[T]]:
+    """
+    Process a raw json response body based on the model type and index.
+
+    Single objects and lists are validated by pydantic straight from the raw
+    body, skipping the intermediate python objects.  Single items picked out by
+    index are decoded and passed on to make_output.
+
+    Args:
+        content (Union[bytes, str]): The raw API response body.
+        model (Type[T]): The model class to instantiate.
+        index (Optional[int]): An optional index for single-item responses.
+
+    Returns:
+        Union[Any, List[Any]]: The processed model instance(s).
+    """
+    stripped = content.lstrip()
+    if index is None and len(stripped) > 2:
+        with retrieved_at_context() as now:
+            if stripped[:1] in (b"{", "{"):
+                mod = model.model_validate_json(content)
+                mod.retrieved_at = now
+                return mod
+            if stripped[:1] in (b"[", "["):
+                return get_list_adapter(model).validate_json(content)
+    return make_output(decode_json(content), model, index)
+
+
+def refreshed_copy(result: Union[T, List[T], None]) -> Union[T, List[T], None]:
+    """
+    Get a shallow copy of a built result, stamped with a new retrieved_at.
+
+    Used when a response is revalidated, so callers never share, or see the
+    old retrieved_at of, the object built from the original response.
+    Nested models are shared with the original.
+    """
+    if result is None:
         return None
+    with retrieved_at_context() as now:
+        if isinstance(result, list):
+            return [item.model_copy(update={"retrieved_at": now}) for item in result]
+        return result.model_copy(update={"retrieved_at": now})
+
+
+class SkippedPart:
+    """
+    The outcome of a part that was never requested, because a part it
+    depends on failed.
+
+    Attributes:
+        reason (str): Why the part was skipped.
+    """
+
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"SkippedPart({self.reason!r})"
+
+
+def collect_parts(names: Sequence[str], results: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Pair the results of asyncio.gather(..., return_exceptions=True) with their names,
+    logging and discarding any part that failed.  Parts that were skipped are
+    left as None too, but the error that caused it is only logged once.
+
+    Args:
+        names (Sequence[str]): The name of each gathered part, in order.
+        results (Sequence[Any]): The gathered results, in the same order.
+
+    Returns:
+        Dict[str, Any]: A mapping of each name to its result, or None if that part failed.
+
+    Raises:
+        BaseException: The first error encountered, if every single part failed.
+    """
+    output: Dict[str, Any] = {}
+    errors = []
+    skipped = 0
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            hd2api_logger.error("Error raised when calling %s: %s", name, result)
+            errors.append(result)
+            output[name] = None
+        elif isinstance(result, SkippedPart):
+            hd2api_logger.info("Skipped %s: %s", name, result.reason)
+            skipped += 1
+            output[name] = None
+        else:
+            output[name] = result
+    if errors and len(errors) + skipped == len(output):
+        raise errors[0]
+    return output
+
+
+def gather_futures(futures: Sequence["Future[Any]"]) -> List[Any]:
+    """
+    Wait for every future, returning each result or the exception it raised,
+    in the same manner as asyncio.gather(..., return_exceptions=True).
+    """
+    results: List[Any] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
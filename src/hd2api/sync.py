@@ -0,0 +1,107 @@
+"""
+Synchronous versions of every getter in hd2api, under the same names.
+
+Meant for batch jobs and worker threads that would otherwise need an event
+loop just to fetch data.  Requests share the pooled ``httpx.Client`` of the
+APIConfig's session, so call ``api_config.close()`` (or use the config as a
+context manager) once done.
+
+Each getter here is the async getter of hd2api.services, run in blocking
+mode, see hd2api.services.service_sync, so the two can't drift apart.
+
+Example:
+    from hd2api import APIConfig
+    from hd2api.sync import GetApiDirectWarStatus
+
+    with APIConfig() as config:
+        status = GetApiDirectWarStatus(config)
+"""
+
+from . import services
+from .services.service_sync import synchronous
+
+GetCommApiRawWarStatus = synchronous(services.GetCommApiRawWarStatus)
+GetCommApiRawWarInfo = synchronous(services.GetCommApiRawWarInfo)
+GetCommApiRawSummary = synchronous(services.GetCommApiRawSummary)
+GetCommApiRawAssignment = synchronous(services.GetCommApiRawAssignment)
+GetCommApiRawNewsFeed = synchronous(services.GetCommApiRawNewsFeed)
+GetCommApiRawSpaceStation = synchronous(services.GetCommApiRawSpaceStation)
+GetCommApiRawAll = synchronous(services.GetCommApiRawAll)
+GetApiV1War = synchronous(services.GetApiV1War)
+GetApiV1AssignmentsAll = synchronous(services.GetApiV1AssignmentsAll)
+GetApiV1Assignments = synchronous(services.GetApiV1Assignments)
+GetApiV1CampaignsAll = synchronous(services.GetApiV1CampaignsAll)
+GetApiV1Campaigns = synchronous(services.GetApiV1Campaigns)
+GetApiV1DispatchesAll = synchronous(services.GetApiV1DispatchesAll)
+GetApiV1Dispatches = synchronous(services.GetApiV1Dispatches)
+GetApiV1PlanetsAll = synchronous(services.GetApiV1PlanetsAll)
+GetApiV1Planets = synchronous(services.GetApiV1Planets)
+GetApiV1PlanetEvents = synchronous(services.GetApiV1PlanetEvents)
+GetApiV1Steam = synchronous(services.GetApiV1Steam)
+GetApiV1Steam2 = synchronous(services.GetApiV1Steam2)
+GetApiDirectWarStatus = synchronous(services.GetApiDirectWarStatus)
+GetApiDirectWarInfo = synchronous(services.GetApiDirectWarInfo)
+GetApiDirectSummary = synchronous(services.GetApiDirectSummary)
+GetApiDirectAssignment = synchronous(services.GetApiDirectAssignment)
+GetApiDirectEpisode = synchronous(services.GetApiDirectEpisode)
+GetApiDirectNewsFeed = synchronous(services.GetApiDirectNewsFeed)
+GetApiDirectSpaceStation = synchronous(services.GetApiDirectSpaceStation)
+GetApiDirectAll = synchronous(services.GetApiDirectAll)
+GetDhApiRawWarStatus = synchronous(services.GetDhApiRawWarStatus)
+GetDhApiRawWarInfo = synchronous(services.GetDhApiRawWarInfo)
+GetDhApiRawSummary = synchronous(services.GetDhApiRawSummary)
+GetDhApiRawAssignment = synchronous(services.GetDhApiRawAssignment)
+GetDhApiRawNewsFeed = synchronous(services.GetDhApiRawNewsFeed)
+GetDhApiRawSpaceStation = synchronous(services.GetDhApiRawSpaceStation)
+GetDhApiRawAll = synchronous(services.GetDhApiRawAll)
+GetApiRawWarStatus = synchronous(services.GetApiRawWarStatus)
+GetApiRawWarInfo = synchronous(services.GetApiRawWarInfo)
+GetApiRawSummary = synchronous(services.GetApiRawSummary)
+GetApiRawAssignment = synchronous(services.GetApiRawAssignment)
+GetApiRawNewsFeed = synchronous(services.GetApiRawNewsFeed)
+GetApiRawSpaceStation = synchronous(services.GetApiRawSpaceStation)
+GetApiRawAll = synchronous(services.GetApiRawAll)
+
+__all__ = [
+    "GetCommApiRawWarStatus",
+    "GetCommApiRawWarInfo",
+    "GetCommApiRawSummary",
+    "GetCommApiRawAssignment",
+    "GetCommApiRawNewsFeed",
+    "GetCommApiRawSpaceStation",
+    "GetCommApiRawAll",
+    "GetApiV1War",
+    "GetApiV1AssignmentsAll",
+    "GetApiV1Assignments",
+    "GetApiV1CampaignsAll",
+    "GetApiV1Campaigns",
+    "GetApiV1DispatchesAll",
+    "GetApiV1Dispatches",
+    "GetApiV1PlanetsAll",
+    "GetApiV1Planets",
+    "GetApiV1PlanetEvents",
+    "GetApiV1Steam",
+    "GetApiV1Steam2",
+    "GetApiDirectWarStatus",
+    "GetApiDirectWarInfo",
+    "GetApiDirectSummary",
+    "GetApiDirectAssignment",
+    "GetApiDirectEpisode",
+    "GetApiDirectNewsFeed",
+    "GetApiDirectSpaceStation",
+    "GetApiDirectAll",
+    "GetDhApiRawWarStatus",
+    "GetDhApiRawWarInfo",
+    "GetDhApiRawSummary",
+    "GetDhApiRawAssignment",
+    "GetDhApiRawNewsFeed",
+    "GetDhApiRawSpaceStation",
+    "GetDhApiRawAll",
+    "GetApiRawWarStatus",
+    "GetApiRawWarInfo",
+    "GetApiRawSummary",
+    "GetApiRawAssignment",
+    "GetApiRawNewsFeed",
+    "GetApiRawSpaceStation",
+    "GetApiRawAll",
+]
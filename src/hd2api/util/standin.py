@@ -0,0 +1,346 @@
+"""
+A local stand-in for the game's api, the community api and diveharder,
+for load and soak testing without touching the real services.
+
+Every route is served from one port, since the paths of the three apis
+don't overlap, so api_direct, api_comm and api_diveharder can all point at it.
+Responses come from a fixture directory recorded with
+``APIConfig(transport="record")``, or from a synthetic galaxy when no
+fixtures are given.
+
+Run it in-process with StandInServer, or as a subprocess with:
+    python -m hd2api.util.standin [--fixtures DIR] [--scale N] [--latency S]
+        [--error-rate P] [--rate-limited P] [--port PORT]
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from .synthetic import synthetic_snapshot_payload
+
+hd2api_logger = logging.getLogger("hd2api_logger")
+
+# Keys holding a planet index, offset in the copies made when scaling payloads.
+PLANET_KEYS = ("index", "planetIndex", "source", "target")
+
+JSON = "application/json"
+
+# The synthetic payload served by each raw route, for the game's api, the
+# community api's raw proxy and diveharder.
+SYNTHETIC_ROUTES: List[Tuple[str, str]] = [
+    (r"/api/WarSeason/\d+/Status", "status"),
+    (r"/api/WarSeason/\d+/WarInfo", "war_info"),
+    (r"/api/Stats/War/\d+/Summary", "planet_stats"),
+    (r"/api/v2/Assignment/War/\d+", "major_order"),
+    (r"/api/NewsFeed/\d+", "news_feed"),
+    (r"/api/Episode/\d+", "episodes"),
+    (r"/raw/api/WarSeason/\d+/Status", "status"),
+    (r"/raw/api/WarSeason/\d+/WarInfo", "war_info"),
+    (r"/raw/api/Stats/War/\d+/Summary", "planet_stats"),
+    (r"/raw/api/v2/Assignment/War/\d+", "major_order"),
+    (r"/raw/api/NewsFeed/\d+", "news_feed"),
+    (r"/raw/status", "status"),
+    (r"/raw/war_info", "war_info"),
+    (r"/raw/planet_stats", "planet_stats"),
+    (r"/raw/major_order", "major_order"),
+    (r"/raw/news_feed", "news_feed"),
+    (r"/raw/all", ""),
+]
+
+
+def _max_index(data: Any) -> int:
+    if isinstance(data, dict):
+        found = [v for k, v in data.items() if k in PLANET_KEYS and isinstance(v, int)]
+        found.extend(_max_index(v) for v in data.values())
+        return max(found, default=-1)
+    if isinstance(data, list):
+        return max((_max_index(v) for v in data), default=-1)
+    return -1
+
+
+def _offset(item: Dict[str, Any], offset: int) -> Dict[str, Any]:
+    item = copy.deepcopy(item)
+    for key in PLANET_KEYS:
+        if isinstance(item.get(key, None), int):
+            item[key] += offset
+    return item
+
+
+def _scale(data: Any, scale: int, stride: int) -> Any:
+    if isinstance(data, dict):
+        return {k: _scale(v, scale, stride) for k, v in data.items()}
+    if isinstance(data, list):
+        items = [_scale(v, scale, stride) for v in data]
+        if items and all(
+            isinstance(v, dict) and any(k in v for k in PLANET_KEYS) for v in items
+        ):
+            base = list(items)
+            items.extend(_offset(v, n * stride) for n in range(1, scale) for v in base)
+        return items
+    return data
+
+
+def scale_payload(data: Any, scale: int) -> Any:
+    """
+    Make a recorded payload describe a galaxy scale times larger.
+
+    Every list of planet keyed objects is repeated scale times, with the
+    planet indexes of each copy moved past the largest index in the payload.
+
+    Args:
+        data (Any): The decoded json payload.
+        scale (int): How many copies of every planet to serve.
+
+    Returns:
+        Any: The scaled payload.
+    """
+    if scale <= 1:
+        return data
+    return _scale(data, scale, _max_index(data) + 1)
+
+
+class Route:
+    """A response body served for every path matching pattern."""
+
+    def __init__(self, pattern: str, body: bytes, content_type: str):
+        self.pattern: Pattern[str] = re.compile(pattern + r"/?")
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{zlib.crc32(body):08x}"'
+
+
+class StandInServer:
+    """
+    Threaded http server emulating the three upstream apis.
+
+    Connections are kept alive, and every response has an ETag, so client
+    connection pooling and revalidation behave as they would live.
+
+    Args:
+        fixtures (Optional[str]): A fixture directory recorded with
+            ``APIConfig(transport="record")``.  If None, a synthetic galaxy is
+            served for every raw route.
+        scale (int): How many copies of the galaxy to serve.
+        latency (float): Seconds to wait before every response.
+        error_rate (float): Fraction of requests answered with a 503.
+        rate_limited (float): Fraction of requests answered with a 429.
+        retry_after (float): Retry-After seconds sent with every 429.
+        seed (int): Seed of the synthetic galaxy and of the injected failures.
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 picking a free one.
+
+    Example:
+        with StandInServer(scale=10, latency=0.05) as server:
+            config = APIConfig(
+                api_direct=server.url,
+                api_comm=server.url,
+                api_diveharder=server.url,
+            )
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[str] = None,
+        scale: int = 1,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limited: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.routes = (
+            self.load_fixtures(fixtures, scale)
+            if fixtures
+            else self.synthetic_routes(scale, seed)
+        )
+        self.counts: Dict[int, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """The base url to point api_direct, api_comm and api_diveharder at."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def synthetic_routes(scale: int, seed: int) -> List[Route]:
+        """Routes serving a synthetic galaxy made from the bundled static data."""
+        from ..api_config import APIConfig
+
+        payload = synthetic_snapshot_payload(
+            APIConfig().staticdata(), scale=scale, seed=seed
+        )
+        parts = dict(payload, episodes={"episodes": []})
+        return [
+            Route(pattern, json.dumps(parts[key] if key else payload).encode(), JSON)
+            for pattern, key in SYNTHETIC_ROUTES
+        ]
+
+    @staticmethod
+    def load_fixtures(directory: str, scale: int) -> List[Route]:
+        """Routes serving every response in a fixture directory, by path."""
+        routes = []
+        for host in sorted(os.listdir(directory)):
+            folder = os.path.join(directory, host)
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                if not name.endswith(".json"):
+                    continue
+                with open(os.path.join(folder, name), "rb") as f:
+                    meta = json.loads(f.read())
+                if meta.get("status_code", 200) != 200:
+                    continue
+                body_path = os.path.join(folder, name[: -len(".json")] + ".body")
+                with open(body_path, "rb") as f:
+                    body = f.read()
+                headers = {k.lower(): v for k, v in meta.get("headers", {}).items()}
+                content_type = headers.get("content-type", JSON)
+                if scale > 1 and "json" in content_type:
+                    body = json.dumps(scale_payload(json.loads(body), scale)).encode()
+                path = meta["url"].split("://", 1)[-1]
+                path = "/" + path.split("/", 1)[-1].split("?", 1)[0].strip("/")
+                routes.append(Route(re.escape(path), body, content_type))
+        return routes
+
+    def match(self, path: str) -> Optional[Route]:
+        path = path.split("?", 1)[0]
+        for route in self.routes:
+            if route.pattern.fullmatch(path):
+                return route
+        return None
+
+    def _count(self, status: int) -> None:
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if server.latency > 0:
+                    time.sleep(server.latency)
+                roll = server._roll()
+                if roll < server.rate_limited:
+                    self.reply(429, b'{"error": "Too many requests."}', JSON)
+                    return
+                if roll < server.rate_limited + server.error_rate:
+                    self.reply(503, b'{"error": "Injected failure."}', JSON)
+                    return
+                route = server.match(self.path)
+                if route is None:
+                    self.reply(404, b'{"error": "Not found."}', JSON)
+                elif self.headers.get("If-None-Match", None) == route.etag:
+                    self.reply(304, b"", route.content_type, route.etag)
+                else:
+                    self.reply(200, route.body, route.content_type, route.etag)
+
+            def reply(
+                self,
+                status: int,
+                body: bytes,
+                content_type: str,
+                etag: Optional[str] = None,
+            ) -> None:
+                server._count(status)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                if status == 429:
+                    self.send_header("Retry-After", f"{server.retry_after:g}")
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                hd2api_logger.debug("standin: " + format, *args)
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving, and close the listening socket."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixtures", default=None, help="Recorded fixture directory.")
+    parser.add_argument("--scale", type=int, default=1, help="Galaxy size multiplier.")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limited", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        fixtures=args.fixtures,
+        scale=args.scale,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limited=args.rate_limited,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    # The first line printed is the url, for a parent process to read.
+    print(server.url, flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"responses by status: {server.counts}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import random
+from typing import Any, Dict, List
+
+from ..models import StaticAll
+
+
+def synthetic_snapshot_payload(
+    statics: StaticAll, scale: int = 1, seed: int = 0, war_time: int = 40000000
+) -> Dict[str, Any]:
+    """
+    Generate a raw, diveharder 'all' shaped json payload for a plausible galaxy.
+
+    Used for benchmarking and offline testing when no recorded payloads are around.
+    Every planet in the static planet data is included scale times over, with
+    copies past the first given new planet indexes.
+
+    Args:
+        statics (StaticAll): Static data the planets, regions and effects are taken from.
+        scale (int): How many copies of the static galaxy to generate.
+        seed (int): Seed for the random state of every planet.
+        war_time (int): The internal war time of the snapshot.
+
+    Returns:
+        Dict[str, Any]: A dictionary with the status, war_info, planet_stats,
+        major_order and news_feed payloads.
+    """
+    rng = random.Random(seed)
+    gstatic = statics.galaxystatic
+    base_indexes = sorted(gstatic.planets.keys()) if gstatic and gstatic.planets else []
+    stride = (max(base_indexes) + 1) if base_indexes else 0
+    region_hashes = list(gstatic.planetRegion.keys()) if gstatic else []
+    effect_ids: List[int] = []
+    if statics.effectstatic is not None:
+        effect_ids = list(statics.effectstatic.planetEffects.keys())
+
+    indexes = [copy * stride + i for copy in range(scale) for i in base_indexes]
+
+    planet_status, planet_infos, planet_stats = [], [], []
+    region_status, region_infos = [], []
+    attacks, campaigns, events, effects = [], [], [], []
+    for index in indexes:
+        owner = rng.choice([1, 1, 1, 2, 3, 4])
+        position = {"x": rng.uniform(-1, 1), "y": rng.uniform(-1, 1)}
+        max_health = 1000000
+        health = max_health if owner == 1 else rng.randint(0, max_health)
+        players = rng.choice([0, 0, 0, rng.randint(1, 50000)])
+        planet_status.append(
+            {
+                "index": index,
+                "owner": owner,
+                "health": health,
+                "regenPerSecond": rng.choice([0.0, 1.3888888, 4.1666665]),
+                "players": players,
+                "position": position,
+            }
+        )
+        planet_infos.append(
+            {
+                "index": index,
+                "settingsHash": rng.getrandbits(32),
+                "position": position,
+                "waypoints": [rng.choice(indexes) for _ in range(rng.randint(0, 4))],
+                "sector": index // 5,
+                "maxHealth": max_health,
+                "disabled": False,
+                "initialOwner": 1,
+            }
+        )
+        planet_stats.append(synthetic_stats(rng, planetIndex=index))
+        if region_hashes and rng.random() < 0.5:
+            for region_index in range(rng.randint(1, 4)):
+                region_infos.append(
+                    {
+                        "planetIndex": index,
+                        "regionIndex": region_index,
+                        "settingsHash": rng.choice(region_hashes),
+                        "maxHealth": 100000,
+                        "regionSize": rng.randint(0, 3),
+                        "flags": 1,
+                        "damageMultiplier": 1.0,
+                    }
+                )
+                region_status.append(
+                    {
+                        "planetIndex": index,
+                        "regionIndex": region_index,
+                        "owner": owner,
+                        "health": rng.randint(0, 100000),
+                        "regerPerSecond": 0.0,
+                        "availabilityFactor": 1.0,
+                        "isAvailable": owner != 1,
+                        "players": rng.randint(0, 5000),
+                    }
+                )
+        if owner != 1 and rng.random() < 0.3:
+            campaigns.append(
+                {
+                    "id": len(campaigns) + 1,
+                    "planetIndex": index,
+                    "type": 0,
+                    "count": 1,
+                    "race": owner,
+                }
+            )
+            attacks.append({"source": rng.choice(indexes), "target": index})
+        if owner == 1 and rng.random() < 0.02:
+            events.append(
+                {
+                    "id": len(events) + 1,
+                    "planetIndex": index,
+                    "eventType": 1,
+                    "race": rng.choice([2, 3, 4]),
+                    "health": rng.randint(0, 500000),
+                    "maxHealth": 500000,
+                    "startTime": war_time - 3600,
+                    "expireTime": war_time + 86400,
+                    "campaignId": len(campaigns) + 1,
+                    "jointOperationIds": [len(events) + 1],
+                    "potentialBuildUp": 0,
+                }
+            )
+        if effect_ids and rng.random() < 0.4:
+            effects.append({"index": index, "galacticEffectId": rng.choice(effect_ids)})
+
+    return {
+        "status": {
+            "warId": 801,
+            "time": war_time,
+            "impactMultiplier": 0.01,
+            "storyBeatId32": 0,
+            "planetStatus": planet_status,
+            "planetRegions": region_status,
+            "planetAttacks": attacks,
+            "campaigns": campaigns,
+            "jointOperations": [],
+            "planetEvents": events,
+            "planetActiveEffects": effects,
+            "globalEvents": [],
+            "spaceStations": [],
+            "globalResources": [],
+            "layoutVersion": 1,
+        },
+        "war_info": {
+            "warId": 801,
+            "startDate": 1706040313,
+            "endDate": 1769112313,
+            "layoutVersion": 1,
+            "minimumClientVersion": "0.3.0",
+            "planetInfos": planet_infos,
+            "homeWorlds": [{"race": 1, "planetIndices": [0]}],
+            "capitalInfos": [],
+            "planetPermanentEffects": [],
+            "planetRegions": region_infos,
+        },
+        "planet_stats": {
+            "galaxy_stats": synthetic_stats(rng),
+            "planets_stats": planet_stats,
+        },
+        "major_order": [],
+        "news_feed": [
+            {
+                "id": 1000 + i,
+                "published": war_time - 1000 * i,
+                "type": 0,
+                "tagIds": [],
+                "message": f"Synthetic dispatch {i}",
+            }
+            for i in range(10)
+        ],
+    }
+
+
+def synthetic_stats(rng: random.Random, **extra: Any) -> Dict[str, Any]:
+    """Generate a random planet or galaxy statistics payload."""
+    won = rng.randint(0, 10**6)
+    lost = rng.randint(0, 10**5)
+    fired = rng.randint(0, 10**9)
+    hit = rng.randint(0, fired)
+    return {
+        **extra,
+        "missionsWon": won,
+        "missionsLost": lost,
+        "missionTime": rng.randint(0, 10**9),
+        "bugKills": rng.randint(0, 10**8),
+        "automatonKills": rng.randint(0, 10**8),
+        "illuminateKills": rng.randint(0, 10**8),
+        "bulletsFired": fired,
+        "bulletsHit": hit,
+        "timePlayed": rng.randint(0, 10**9),
+        "deaths": rng.randint(0, 10**7),
+        "revives": 0,
+        "friendlies": rng.randint(0, 10**6),
+        "missionSuccessRate": int(100 * won / max(won + lost, 1)),
+        "accurracy": int(100 * hit / max(fired, 1)),
+    }
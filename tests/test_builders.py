@@ -0,0 +1,185 @@
+import pytest
+
+from hd2api import *
+from hd2api.util.synthetic import synthetic_snapshot_payload
+
+
+def dump(model, ignore=()):
+    """Dump a model without the retrieved_at times stamped while building it."""
+    ignore = {"retrieved_at", *ignore}
+
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k not in ignore}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+
+    return strip(model.model_dump())
+
+
+@pytest.fixture(scope="module")
+def statics():
+    return APIConfig().staticdata()
+
+
+@pytest.fixture(scope="module")
+def warall(statics):
+    return DiveharderAll(**synthetic_snapshot_payload(statics, seed=5))
+
+
+def test_snapshot_index_matches_scans(warall, statics):
+    from hd2api.util import get_item
+
+    index = SnapshotIndex.from_warall(warall)
+    for planet_info in warall.war_info.planetInfos[:50]:
+        i = planet_info.index
+        assert index.info_by_planet[i] is planet_info
+        status = get_item(warall.status.planetStatus, index=i)
+        assert index.status_by_planet[i] is status
+        assert index.event_by_planet.get(i) is get_item(
+            warall.status.planetEvents, planetIndex=i
+        )
+        assert index.attacks_by_source.get(i, []) == [
+            a.target for a in warall.status.planetAttacks if a.source == i
+        ]
+
+    planets = build_all_planets(warall, statics)
+    for i in list(planets)[:20]:
+        assert dump(build_planet_2(i, warall, statics)) == dump(planets[i])
+
+
+def test_single_planet_build_reuses_index(statics):
+    warall = DiveharderAll(**synthetic_snapshot_payload(statics, seed=7))
+    i = warall.war_info.planetRegions[0].planetIndex
+    planet = build_planet_2(i, warall, statics)
+    index = get_snapshot_index(warall)
+    assert build_planet_2(i, warall, statics) is not planet
+    assert get_snapshot_index(warall) is index
+
+    regions = build_planet_regions(i, warall, statics)
+    assert [r.regionIndex for r in regions] == [r.regionIndex for r in planet.regions]
+    assert [r.regionIndex for r in regions] == [
+        r.regionIndex for r in build_all_regions(warall, statics) if r.planetIndex == i
+    ]
+
+    warall.status = warall.status.model_copy()
+    assert get_snapshot_index(warall) is not index
+
+
+def test_rebuild_matches_full_build(statics):
+    import copy
+
+    payload = synthetic_snapshot_payload(statics, seed=11)
+    first = DiveharderAll(**payload)
+    previous = rebuild_all_planets(None, first, statics)
+
+    changed = copy.deepcopy(payload)
+    status = changed["status"]
+    status["time"] += 10
+    status["planetStatus"][0]["health"] -= 5
+    status["planetStatus"][1]["players"] += 1
+    changed["planet_stats"]["planets_stats"][2]["missionsWon"] += 1
+    effect_id = status["planetActiveEffects"][0]["galacticEffectId"]
+    status["planetActiveEffects"].append({"index": 3, "galacticEffectId": effect_id})
+    status["planetRegions"][0]["health"] -= 1
+    region_planet = status["planetRegions"][0]["planetIndex"]
+    second = DiveharderAll(**changed)
+
+    rebuilt = rebuild_all_planets(previous, second, statics)
+    full = build_all_planets(second, statics)
+    assert list(rebuilt) == list(full)
+    for i, planet in full.items():
+        assert dump(rebuilt[i]) == dump(planet)
+
+    event_planets = {e["planetIndex"] for e in status["planetEvents"]}
+    expected = {0, 1, 2, 3, region_planet} | event_planets
+    for i, planet in rebuilt.items():
+        assert (planet is previous[i]) == (i not in expected)
+
+    # One event ended, one changed and one started.
+    third = copy.deepcopy(changed)
+    events = third["status"]["planetEvents"]
+    ended = events.pop(0)["planetIndex"]
+    events[0]["health"] -= 100
+    started = next(
+        p["index"]
+        for p in third["war_info"]["planetInfos"]
+        if p["index"] not in event_planets
+    )
+    events.append(dict(events[0], id=99, planetIndex=started))
+    third = DiveharderAll(**third)
+
+    again = rebuild_all_planets(rebuilt, third, statics)
+    full = build_all_planets(third, statics)
+    # Event times are worked out from the current time, not the snapshot's.
+    event_times = ("startTime", "endTime")
+    for i, planet in full.items():
+        assert dump(again[i], event_times) == dump(planet, event_times)
+    assert again[ended].event is None and rebuilt[ended].event is not None
+    assert again[events[0]["planetIndex"]].event.health == events[0]["health"]
+    assert again[started].event is not None
+
+
+def count_planets(built):
+    return len(built.planets)
+
+
+def test_build_snapshots_matches_serial(statics):
+    payloads = [synthetic_snapshot_payload(statics, seed=seed) for seed in range(5)]
+    serial = [build_snapshot(DiveharderAll(**p), statics) for p in payloads]
+    # Every kind of snapshot source, split into uneven chunks over two workers.
+    sources = [
+        payloads[0],
+        DiveharderAll(**payloads[1]),
+        DiveharderAll(**payloads[2]).model_dump_json(),
+        payloads[3],
+        payloads[4],
+    ]
+    pooled = list(build_snapshots(sources, statics, max_workers=2, chunksize=2))
+
+    # Event times are worked out from the current time, not the snapshot's.
+    event_times = ("startTime", "endTime")
+    assert len(pooled) == len(serial)
+    for built, expected in zip(pooled, serial):
+        assert list(built.planets) == list(expected.planets)
+        for kind in ("planets", "regions", "campaigns"):
+            got, want = getattr(built, kind), getattr(expected, kind)
+            if kind == "planets":
+                got, want = got.values(), want.values()
+            assert [dump(m, event_times) for m in got] == [
+                dump(m, event_times) for m in want
+            ]
+
+    counts = build_snapshots(sources, statics, max_workers=2, process=count_planets)
+    assert list(counts) == [len(b.planets) for b in serial]
+
+
+def test_static_table_is_cached_until_statics_change():
+    gstatic = APIConfig().staticdata().galaxystatic
+    table = get_static_table(gstatic)
+    assert get_static_table(gstatic) is table
+
+    index, planet_base = next(iter(gstatic.planets.items()))
+    resolved = table.planets[index]
+    assert resolved.name == planet_base.names.get("en-US", planet_base.name)
+    assert resolved.biome is gstatic.biomes.get(planet_base.biome)
+    assert resolved.hazards == [
+        gstatic.environmentals.get(e)
+        for e in planet_base.environmentals + planet_base.weather_effects
+    ]
+
+    renamed = planet_base.model_copy(update={"name": "Renamed", "names": None})
+    copied = gstatic.model_copy(update={"planets": {index: renamed}})
+    assert get_static_table(copied).planets[index].name == "Renamed"
+    assert get_static_table(gstatic) is table
+
+    gstatic.biomes = dict(gstatic.biomes)
+    assert get_static_table(gstatic) is not table
+    table = get_static_table(gstatic)
+    assert get_static_table(gstatic) is table
+    gstatic.planets = {index: renamed}
+    rebuilt = get_static_table(gstatic)
+    assert rebuilt is not table
+    assert list(rebuilt.planets) == [index]
+    assert rebuilt.planets[index].name == "Renamed"
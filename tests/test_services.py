@@ -0,0 +1,712 @@
+import asyncio
+import datetime as dt
+
+import httpx
+import pytest
+
+from hd2api import *
+from hd2api.services.service_session import APISession
+from hd2api.services.service_utils import make_output, make_output_from_json
+from hd2api.util.synthetic import synthetic_snapshot_payload
+
+DIRECT = "http://direct.test"
+DIVEHARDER = "http://diveharder.test"
+
+
+@pytest.fixture(scope="module")
+def payload():
+    return synthetic_snapshot_payload(APIConfig().staticdata())
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    """Answer the requests of every new pooled client with a handler, offline."""
+
+    def install(handler):
+        requests = []
+
+        def record(request):
+            requests.append(request)
+            return handler(request)
+
+        monkeypatch.setattr(
+            APISession,
+            "_make_transport",
+            lambda self, transport_class: httpx.MockTransport(record),
+        )
+        return requests
+
+    return install
+
+
+def without_retrieved_at(value):
+    """A model_dump with every retrieved_at removed, for comparing separate builds."""
+    if isinstance(value, dict):
+        return {k: without_retrieved_at(v) for k, v in value.items() if k != "retrieved_at"}
+    if isinstance(value, list):
+        return [without_retrieved_at(v) for v in value]
+    return value
+
+
+def direct_routes(payload, failing=()):
+    """A handler serving payload from the direct api paths, with 500 for failing ones."""
+    bodies = {
+        "Status": payload["status"],
+        "WarInfo": payload["war_info"],
+        "Summary": payload["planet_stats"],
+        "Assignment": payload["major_order"],
+        "NewsFeed": payload["news_feed"],
+        "Episode": {"episodes": []},
+    }
+
+    def handler(request):
+        for name, body in bodies.items():
+            if name in request.url.path:
+                if name in failing:
+                    return httpx.Response(500)
+                return httpx.Response(200, json=body)
+        return httpx.Response(404)
+
+    return handler
+
+
+def test_make_output_shares_one_timestamp():
+    data = {
+        "warId": 801,
+        "time": 1000,
+        "planetStatus": [
+            {"index": 1, "owner": 1, "position": {"x": 0.5, "y": 0.5}},
+            {"index": 2, "owner": 2, "position": {"x": 0.1, "y": 0.2}},
+        ],
+    }
+    status = make_output(data, WarStatus)
+    stamps = {status.retrieved_at}
+    for planet in status.planetStatus:
+        stamps.update((planet.retrieved_at, planet.position.retrieved_at))
+    assert len(stamps) == 1
+
+    statuses = make_output_from_json(b'[{"index": 1}, {"index": 2}]', PlanetStatus)
+    assert statuses[0].retrieved_at == statuses[1].retrieved_at
+    assert statuses[0].retrieved_at.tzinfo is not None
+
+
+def test_lists_validate_in_one_call(payload):
+    from pydantic import ValidationError
+
+    from hd2api.services.service_utils import get_list_adapter
+
+    assert get_list_adapter(PlanetStatus) is get_list_adapter(PlanetStatus)
+    data = payload["status"]["planetStatus"]
+    statuses = make_output(data, PlanetStatus)
+    one_by_one = [PlanetStatus(**item) for item in data]
+    dumped = without_retrieved_at([s.model_dump() for s in statuses])
+    assert dumped == without_retrieved_at([s.model_dump() for s in one_by_one])
+    assert len({s.retrieved_at for s in statuses}) == 1
+    assert make_output([], PlanetStatus) == []
+
+    with pytest.raises(ValidationError):
+        make_output([{"index": 1}, {"index": "not a number"}], PlanetStatus)
+
+
+def test_retrieved_at_outside_of_responses():
+    before = dt.datetime.now(tz=dt.timezone.utc)
+    assert PlanetStatus(index=1).retrieved_at >= before
+    parsed = PlanetStatus(index=1, retrieved_at="2024-01-01T00:00:00")
+    assert parsed.retrieved_at == dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+
+
+def test_retrieved_at_is_always_set():
+    built = [
+        PlanetStatus(index=1),
+        PlanetStatus.model_construct(index=1),
+        make_output({"index": 1}, PlanetStatus),
+        make_output_from_json(b'{"index": 1}', PlanetStatus),
+        make_output_from_json(b'[{"index": 1}]', PlanetStatus)[0],
+    ]
+    for status in built:
+        # As before retrieved_at became a default_factory field.
+        assert status.model_dump(exclude_unset=True) == {
+            "index": 1,
+            "retrieved_at": status.retrieved_at,
+        }
+
+
+def test_request_record_and_histogram():
+    from hd2api.services.service_hooks import HistogramHook, RequestRecord
+
+    record = RequestRecord("http://host/api/WarSeason/WARID/Status", "http://host")
+    record.start_attempt()
+    record.trace("connection.connect_tcp.started", {})
+    record.trace("connection.connect_tcp.complete", {})
+    record.trace("http11.receive_response_headers.complete", {})
+    assert record.attempts == 1
+    assert record.connect_time is not None and record.ttfb >= record.connect_time
+    assert record.tls_time is None
+
+    histograms = HistogramHook(bounds=[0.01, 0.1, 1.0])
+    for total in (0.005, 0.05, 0.05, 0.5):
+        record.total_time = total
+        record.status = 200
+        histograms(record)
+    stats = histograms.stats()[record.endpoint]
+    assert stats["total_time"]["count"] == 4
+    assert stats["total_time"]["p50"] == 0.1
+    assert stats["total_time"]["max"] == 0.5
+    assert stats["statuses"] == {200: 4}
+
+
+def test_record_and_replay(tmp_path):
+    from hd2api.services.service_replay import RecordingTransport, ReplayTransport
+    from hd2api.sync import GetApiDirectWarStatus
+
+    status = synthetic_snapshot_payload(APIConfig().staticdata())["status"]
+    live = httpx.MockTransport(
+        lambda request: httpx.Response(200, json=status, headers={"ETag": '"v1"'})
+    )
+    with httpx.Client(
+        base_url="http://live.test",
+        transport=RecordingTransport(str(tmp_path), live),
+        headers={"Accept-Language": "en-US"},
+    ) as client:
+        recorded = client.get("/api/WarSeason/801/Status").json()
+
+    with APIConfig(
+        api_direct="http://live.test", transport="replay", fixture_dir=str(tmp_path)
+    ) as config:
+        replayed = GetApiDirectWarStatus(config)
+    assert replayed.warId == recorded["warId"]
+    assert [p.index for p in replayed.planetStatus] == [
+        p["index"] for p in recorded["planetStatus"]
+    ]
+
+    replay = ReplayTransport(str(tmp_path))
+    with httpx.Client(base_url="http://live.test", transport=replay) as client:
+        headers = {"Accept-Language": "en-US", "If-None-Match": '"v1"'}
+        response = client.get("/api/WarSeason/801/Status", headers=headers)
+        assert response.status_code == 304
+        assert client.get("/api/WarSeason/801/Missing").status_code == 404
+
+
+def test_standin_server():
+    from hd2api.sync import GetApiDirectWarStatus, GetDhApiRawAll
+    from hd2api.util.standin import StandInServer, scale_payload
+
+    planets = {"planets": [{"index": 0}, {"index": 4}]}
+    scaled = scale_payload(planets, 2)
+    assert [p["index"] for p in scaled["planets"]] == [0, 4, 5, 9]
+    scaled = scale_payload(planets, 3)
+    assert [p["index"] for p in scaled["planets"]] == [0, 4, 5, 9, 10, 14]
+    indexes = [p["index"] for p in scale_payload(planets, 10)["planets"]]
+    assert len(indexes) == 20 and len(set(indexes)) == 20
+
+    with StandInServer(scale=2) as server:
+        with APIConfig(
+            api_direct=server.url, api_diveharder=server.url, revalidate=True
+        ) as config:
+            status = GetApiDirectWarStatus(config)
+            everything = GetDhApiRawAll(config)
+            assert GetApiDirectWarStatus(config).planetStatus is status.planetStatus
+        assert len(everything.status.planetStatus) == len(status.planetStatus)
+        assert server.counts == {200: 2, 304: 1}
+
+    with StandInServer(error_rate=1.0) as server:
+        config = APIConfig(api_direct=server.url, retry={"max_attempts": 1})
+        with pytest.raises(HTTPException) as error:
+            GetApiDirectWarStatus(config)
+        assert error.value.status_code == 503
+        config.close()
+
+
+def test_news_feed_cursor():
+    from hd2api.services.service_news import NewsFeedCursor
+
+    def items(*pairs):
+        return [NewsFeedItem(id=i, published=p, message=str(i)) for i, p in pairs]
+
+    cursor = NewsFeedCursor(max_items=3, window=1000)
+    assert cursor.from_timestamp(5000) == 4000
+    feed = cursor.merge(items((1, 4100), (2, 4200)), 5000)
+    assert [i.id for i in feed] == [1, 2]
+    assert cursor.from_timestamp(5000) == 4200
+
+    edited = items((2, 4200))[0]
+    edited.message = "edited"
+    feed = cursor.merge([edited] + items((3, 4300), (4, 4300)), 5000)
+    assert [i.id for i in feed] == [2, 3, 4]
+    assert feed[0].message == "edited"
+    assert (cursor.latest_published, cursor.latest_id) == (4300, 4)
+
+    assert [i.id for i in cursor.merge([], 5250)] == [3, 4]
+
+
+def test_pooled_clients_are_reused_and_closed(mock_api, payload):
+    from hd2api import sync
+
+    mock_api(lambda request: httpx.Response(200, json=payload["status"]))
+    config = APIConfig(api_direct=DIRECT)
+
+    async def fetch_twice():
+        await GetApiDirectWarStatus(config)
+        client = config.get_session().get_async_client(DIRECT)
+        await GetApiDirectWarStatus(config)
+        assert config.get_session().get_async_client(DIRECT) is client
+        return client
+
+    first = asyncio.run(fetch_twice())
+    # Closed when asyncio.run shut its loop down.
+    assert first.is_closed
+    second = asyncio.run(fetch_twice())
+    assert second is not first and second.is_closed
+
+    sync.GetApiDirectWarStatus(config)
+    client = config.get_session().get_sync_client(DIRECT)
+    sync.GetApiDirectWarStatus(config)
+    assert config.get_session().get_sync_client(DIRECT) is client
+    config.close()
+    assert client.is_closed
+
+    default = get_default_config()
+    sync.GetApiDirectWarStatus()
+    assert sync.GetApiDirectWarStatus() is not None
+    assert len(default.get_session()._sync_clients) == 1
+    default.close()
+
+
+def test_sessions_follow_their_config(mock_api, payload):
+    mock_api(lambda request: httpx.Response(200, json=payload["status"]))
+    config = APIConfig(api_direct=DIRECT)
+    session = config.get_session()
+    assert config.model_copy().get_session() is not session
+    assert config.model_copy(deep=True).get_session() is not session
+    assert config.get_session() is session
+
+    config.timeout = 5.0
+    assert config.get_session() is not session
+    assert config.get_session().timeout == 5.0
+    config.close()
+
+
+async def test_partial_all(mock_api, payload, caplog):
+    config = APIConfig(api_direct=DIRECT, retry={"max_attempts": 1})
+    mock_api(direct_routes(payload, failing=("WarInfo",)))
+    everything = await GetApiDirectAll(config)
+    assert everything.war_info is None
+    assert everything.status is not None and everything.news_feed is not None
+
+    await config.aclose()
+    caplog.clear()
+    mock_api(direct_routes(payload, failing=("Status",)))
+    everything = await GetApiDirectAll(config)
+    assert everything.status is None and everything.news_feed is None
+    assert everything.planet_stats is not None
+    errors = [r for r in caplog.records if r.levelname == "ERROR"]
+    assert [r.getMessage() for r in errors] == [
+        "Error raised when calling status: 500 Failed with status code: 500"
+    ]
+    assert "Skipped news_feed: status failed" in caplog.messages
+
+    await config.aclose()
+    failing = ("Status", "WarInfo", "Summary", "Assignment", "Episode")
+    mock_api(direct_routes(payload, failing=failing))
+    with pytest.raises(HTTPException):
+        await GetApiDirectAll(config)
+    await config.aclose()
+
+
+async def test_etag_revalidation(mock_api, payload):
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=payload["status"], headers={"ETag": '"v1"'})
+
+    requests = mock_api(handler)
+    async with APIConfig(api_direct=DIRECT) as config:
+        await GetApiDirectWarStatus(config)
+        await GetApiDirectWarStatus(config)
+        assert "If-None-Match" not in requests[1].headers
+
+    async with APIConfig(api_direct=DIRECT, revalidate=True) as config:
+        first = await GetApiDirectWarStatus(config)
+        second = await GetApiDirectWarStatus(config)
+        assert requests[3].headers["If-None-Match"] == '"v1"'
+        assert second is not first
+        assert second.planetStatus is first.planetStatus
+        assert second.retrieved_at > first.retrieved_at
+
+
+async def test_coalescing(mock_api, payload):
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json=payload["status"])
+
+    requests = mock_api(handler)
+    async with APIConfig(api_direct=DIRECT, coalesce=True) as config:
+        session = config.get_session()
+        calls = [asyncio.ensure_future(GetApiDirectWarStatus(config)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        first, second, third = await asyncio.gather(*calls)
+        assert first is second is third
+        assert len(requests) == 1 and session.coalesced == 2
+
+        # Once every caller is cancelled, the shared request is cancelled too.
+        release.clear()
+        calls = [asyncio.ensure_future(GetApiDirectWarStatus(config)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for call in calls:
+            call.cancel()
+        await asyncio.gather(*calls, return_exceptions=True)
+        assert len(requests) == 2 and not session.inflight
+
+    release.set()
+    async with APIConfig(api_direct=DIRECT) as config:
+        await asyncio.gather(*(GetApiDirectWarStatus(config) for _ in range(2)))
+        assert len(requests) == 4
+
+
+async def test_retry(mock_api, payload, monkeypatch):
+    from email.utils import format_datetime
+
+    import hd2api.services.service_base as service_base
+
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr(service_base, "sleep", sleep)
+    later = dt.datetime.now(tz=dt.timezone.utc) + dt.timedelta(seconds=20)
+    answers = [
+        httpx.Response(503, headers={"Retry-After": "2"}),
+        httpx.Response(429, headers={"Retry-After": format_datetime(later, usegmt=True)}),
+        httpx.Response(200, json=payload["status"]),
+    ]
+    requests = mock_api(lambda request: answers[len(requests) - 1])
+    retry = {"max_attempts": 3, "backoff_base": 0}
+    async with APIConfig(api_direct=DIRECT, retry=retry) as config:
+        assert (await GetApiDirectWarStatus(config)).warId == payload["status"]["warId"]
+    assert len(requests) == 3
+    assert delays[0] == 2 and 15 < delays[1] <= 20
+
+    # Neither statuses outside retry_statuses, nor anything by default, is retried.
+    for status, settings in ((404, {"retry": retry}), (503, {})):
+        requests = mock_api(lambda request: httpx.Response(status))
+        async with APIConfig(api_direct=DIRECT, **settings) as config:
+            with pytest.raises(HTTPException):
+                await GetApiDirectWarStatus(config)
+        assert len(requests) == 1 and len(delays) == 2
+
+
+async def test_news_feed_cursor_is_opt_in(mock_api, payload):
+    from hd2api.services.service_news import NEWS_WINDOW
+
+    requests = mock_api(direct_routes(payload))
+    start = payload["status"]["time"] - NEWS_WINDOW
+    for settings, second_start in (({}, start), ({"news_cursor": True}, None)):
+        async with APIConfig(api_direct=DIRECT, **settings) as config:
+            del requests[:]
+            await GetApiDirectAll(config)
+            await GetApiDirectAll(config)
+        news = [r for r in requests if "NewsFeed" in r.url.path]
+        starts = [int(r.url.params["fromTimestamp"]) for r in news]
+        assert starts[0] == start
+        if second_start is not None:
+            assert starts[1] == second_start
+        else:
+            assert starts[1] > start
+
+
+async def test_circuit_breaker(mock_api, payload):
+    from hd2api.services.service_health import SourceHealthTracker
+
+    def handler(request):
+        if request.url.host == "direct.test":
+            return httpx.Response(500)
+        return httpx.Response(200, json=payload["status"])
+
+    requests = mock_api(handler)
+    config = APIConfig(
+        api_direct=DIRECT,
+        api_diveharder=DIVEHARDER,
+        use_raw="failover",
+        failover_sources=["direct", "diveharder"],
+        breaker_threshold=1,
+        breaker_cooldown=0.2,
+    )
+
+    def hosts():
+        sent = [r.url.host.split(".")[0] for r in requests]
+        del requests[:]
+        return sent
+
+    async with config:
+        await GetApiRawWarStatus(config)
+        assert hosts() == ["direct", "diveharder"]
+        # Open, so direct is skipped.
+        await GetApiRawWarStatus(config)
+        assert hosts() == ["diveharder"]
+        # When hedging, an explicit use_raw is skipped while open too.
+        config.use_raw = "direct"
+        config.hedge = True
+        await GetApiRawWarStatus(config)
+        assert hosts() == ["diveharder"]
+        # Half open once the cooldown passes, and open again after one failure.
+        await asyncio.sleep(0.25)
+        await GetApiRawWarStatus(config)
+        assert hosts() == ["direct", "diveharder"]
+        assert config.get_session().health.get("direct").is_open()
+
+    tracker = SourceHealthTracker()
+    for name in ("direct", "diveharder"):
+        tracker.get(name).record_failure(threshold=1, cooldown=60)
+    assert tracker.ranked(["direct", "diveharder"], "All") == ["direct", "diveharder"]
+
+
+def test_byte_accounting(mock_api, payload, tmp_path):
+    import gzip
+    import json
+
+    from hd2api import sync
+    from hd2api.services.service_replay import RecordingTransport
+
+    body = json.dumps(payload["status"]).encode()
+    compressed = gzip.compress(body)
+
+    def handler(request):
+        # Streamed, as a live transport would, so httpx counts what it reads.
+        return httpx.Response(
+            200,
+            stream=httpx.ByteStream(compressed),
+            headers={"Content-Encoding": "gzip", "Content-Length": str(len(compressed))},
+        )
+
+    mock_api(handler)
+    with APIConfig(api_direct=DIRECT) as config:
+        sync.GetApiDirectWarStatus(config)
+        sync.GetApiDirectWarStatus(config)
+        (stats,) = config.get_session().bytes.stats().values()
+    assert stats["requests"] == 2
+    assert stats["compressed_bytes"] == 2 * len(compressed)
+    assert stats["decompressed_bytes"] == 2 * len(body)
+
+    recorder = RecordingTransport(str(tmp_path), httpx.MockTransport(handler))
+    with httpx.Client(base_url=DIRECT, transport=recorder) as client:
+        response = client.get("/api/WarSeason/801/Status")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.num_bytes_downloaded == len(compressed)
+    assert response.content == body
+    meta, recorded = recorder.store.load(response.request)
+    assert recorded == body and "content-encoding" not in meta["headers"]
+
+
+def test_ttl_cache_eviction(mock_api, payload, monkeypatch):
+    from hd2api import sync
+    from hd2api.services import service_cache
+    from hd2api.services.service_cache import CacheBackend, MemoryTTLCache
+
+    with pytest.raises(TypeError):
+        CacheBackend()
+    now = [100.0]
+    monkeypatch.setattr(service_cache.time, "monotonic", lambda: now[0])
+    cache = MemoryTTLCache(max_bytes=100, max_entries=2)
+    cache.set("a", "A", ttl=10, size=10)
+    cache.set("b", "B", ttl=None, size=10)
+    assert cache.get("a") == "A"
+    # b is now the least recently used, so it goes first.
+    cache.set("c", "C", ttl=None, size=10)
+    assert cache.get("b") is None and cache.get("c") == "C"
+    now[0] += 11
+    assert cache.get("a") is None
+    cache.set("d", "D", ttl=None, size=95)
+    assert cache.get("c") is None and cache.get("d") == "D"
+    cache.set("e", "E", ttl=None, size=200)
+    assert cache.get("e") is None
+    # An oversized value isn't stored, and drops the stale one under its key.
+    cache.set("d", "D2", ttl=None, size=200)
+    assert cache.get("d") is None
+    assert cache.stats() == {
+        "hits": 3,
+        "misses": 5,
+        "evictions": 2,
+        "entries": 0,
+        "size_bytes": 0,
+    }
+
+    requests = mock_api(lambda request: httpx.Response(200, json=payload["status"]))
+    with APIConfig(api_direct=DIRECT, cache_enabled=True) as config:
+        first = sync.GetApiDirectWarStatus(config)
+        assert sync.GetApiDirectWarStatus(config) is first
+        now[0] += 11
+        assert sync.GetApiDirectWarStatus(config) is not first
+    assert len(requests) == 2
+
+
+async def test_token_bucket_pacing(mock_api, payload):
+    import time
+
+    from hd2api.services.service_ratelimit import TokenBucket
+
+    bucket = TokenBucket(rate=20, burst=2)
+    start = time.monotonic()
+    waits = [bucket.acquire_sync() for _ in range(4)]
+    assert time.monotonic() - start >= 0.09
+    assert waits[:2] == [0.0, 0.0] and all(w > 0 for w in waits[2:])
+    assert bucket.stats()["throttled"] == 2
+
+    mock_api(lambda request: httpx.Response(200, json=payload["status"]))
+    limit = {"rate": 20, "burst": 1}
+    async with APIConfig(api_direct=DIRECT, rate_limits={DIRECT: limit}) as config:
+        start = time.monotonic()
+        await asyncio.gather(*(GetApiDirectWarStatus(config) for _ in range(4)))
+        assert time.monotonic() - start >= 0.14
+        session = config.get_session()
+        bucket = session.get_rate_limiter(DIRECT, config)
+        stats = bucket.stats()
+        assert stats["acquired"] == 4 and stats["throttled"] == 3
+
+        assert session.get_rate_limiter(DIRECT, config) is bucket
+        config.rate_limits[DIRECT].rate = 1000
+        faster = session.get_rate_limiter(DIRECT, config)
+        assert faster is not bucket and faster.rate == 1000
+        config.rate_limits = {}
+        assert session.get_rate_limiter(DIRECT, config) is None
+        config.rate_limit = RateLimit(rate=50)
+        assert session.get_rate_limiter(DIRECT, config).rate == 50
+        assert config.get_session() is session
+
+
+async def test_hedge_fires_and_wins(mock_api, payload):
+    async def handler(request):
+        if request.url.host == "direct.test":
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=payload["status"])
+
+    requests = mock_api(handler)
+    config = APIConfig(
+        api_direct=DIRECT,
+        api_diveharder=DIVEHARDER,
+        failover_sources=["direct", "diveharder"],
+        hedge=True,
+        hedge_delay=0.05,
+    )
+    async with config:
+        status = await asyncio.wait_for(GetApiRawWarStatus(config), timeout=2)
+        assert status.warId == payload["status"]["warId"]
+        session = config.get_session()
+        assert (session.hedges_fired, session.hedges_won) == (1, 1)
+    assert [r.url.host for r in requests] == ["direct.test", "diveharder.test"]
+
+
+def test_hedge_delay_is_kept_per_endpoint():
+    from hd2api.services.async_raw_service import get_hedge_delay
+
+    config = APIConfig()
+    tracker = config.get_session().health
+    for _ in range(5):
+        # An All request is several requests, so it's far slower than the rest.
+        tracker.get("direct").record_success("All", 1.0)
+        tracker.get("direct").record_success("WarStatus", 0.01)
+        tracker.get("diveharder").record_success("All", 0.5)
+    assert get_hedge_delay("direct", "WarStatus", config) == 0.01
+    assert get_hedge_delay("direct", "All", config) == 1.0
+    assert tracker.get("direct").stats()["latency"] == {"All": 1.0, "WarStatus": 0.01}
+    # diveharder hasn't answered a war status yet, so direct stays healthiest.
+    assert tracker.ranked(["diveharder", "direct"], "WarStatus") == ["direct", "diveharder"]
+    assert tracker.ranked(["direct", "diveharder"], "All") == ["diveharder", "direct"]
+
+
+async def test_json_backends_build_the_same(mock_api, payload):
+    from hd2api.services.service_json import available_backends
+
+    mock_api(direct_routes(payload))
+    built = {}
+    for backend in ["auto", "pydantic", *available_backends()]:
+        async with APIConfig(api_direct=DIRECT, json_backend=backend) as config:
+            status = await GetApiDirectWarStatus(config)
+            news = await GetApiDirectNewsFeed(config)
+        built[backend] = without_retrieved_at(
+            [status.model_dump(), [item.model_dump() for item in news]]
+        )
+    expected = built.pop("json")
+    for backend, dumped in built.items():
+        assert dumped == expected, backend
+
+    with pytest.raises(ValueError):
+        APIConfig(json_backend="simdjson")
+
+
+def test_sync_facade_exports_everything(mock_api, payload):
+    import inspect
+
+    from hd2api import services, sync
+    from hd2api.services import (
+        async_comm_service,
+        async_direct_service,
+        async_diveh_service,
+        async_raw_service,
+    )
+
+    getters = {
+        name
+        for module in (
+            async_comm_service,
+            async_direct_service,
+            async_diveh_service,
+            async_raw_service,
+        )
+        for name, value in vars(module).items()
+        if name.startswith("Get")
+        and inspect.iscoroutinefunction(value)
+        and value.__module__ == module.__name__
+    }
+    assert len(services.__all__) == len(set(services.__all__))
+    assert set(services.__all__) == getters
+    assert sync.__all__ == services.__all__
+    for name in sync.__all__:
+        getter = getattr(sync, name)
+        assert not inspect.iscoroutinefunction(getter)
+        assert getter.__name__ == name
+        assert getter.__wrapped__ is getattr(services, name)
+
+    mock_api(direct_routes(payload))
+    with APIConfig(api_direct=DIRECT) as config:
+        everything = sync.GetApiDirectAll(config)
+    assert everything.status.warId == payload["status"]["warId"]
+    assert everything.news_feed is not None
+
+
+def test_sync_all_builds_one_session(mock_api, payload, monkeypatch):
+    import time
+
+    from hd2api import sync
+
+    built = []
+    init = APISession.__init__
+
+    def slow_init(self, api_config):
+        # Widen the window in which worker threads could race to build one.
+        time.sleep(0.05)
+        init(self, api_config)
+        built.append(self)
+
+    monkeypatch.setattr(APISession, "__init__", slow_init)
+    mock_api(direct_routes(payload))
+    with APIConfig(api_direct=DIRECT) as config:
+        assert sync.GetApiDirectAll(config).status is not None
+        assert built == [config.get_session()]
+
+def test_http2_falls_back_without_h2(mock_api, payload, monkeypatch, caplog):
+    from hd2api import sync
+    from hd2api.services import service_session
+
+    mock_api(lambda request: httpx.Response(200, json=payload["status"]))
+    with APIConfig(api_direct=DIRECT, http2=True) as config:
+        assert config.get_session().http2 == service_session.http2_available()
+
+    monkeypatch.setattr(service_session, "http2_available", lambda: False)
+    with APIConfig(api_direct=DIRECT, http2=True) as config:
+        assert config.get_session().http2 is False
+        assert sync.GetApiDirectWarStatus(config) is not None
+    assert "h2 isn't installed" in caplog.text